@@ -13,12 +13,21 @@ setup(
         "click>=8.1.0",
         "music21>=9.1.0",
         "mido>=1.3.0",
+        "numpy>=1.24.0",
         "midi2audio>=0.1.1",
         "pdf2image>=1.16.0",
         "PyPDF2>=3.0.0",
         "Pillow>=10.0.0",
         "oemer>=0.1.5",
     ],
+    extras_require={
+        # 선택 의존성: 설치 시 더 빠른 경로 사용
+        "fast": [
+            "pyfluidsynth>=1.3.0",
+            "lameenc>=1.4.0",
+            "pymupdf>=1.23.0",
+        ],
+    },
     entry_points={
         "console_scripts": [
             "score-converter=src.cli:main",
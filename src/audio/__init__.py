@@ -1,5 +1,5 @@
 """오디오 생성 모듈"""
 
-from .synthesizer import midi_to_audio, render_parts_audio
+from .synthesizer import midi_to_audio, render_parts_audio, render_audio_stream, open_render_session, FluidSynthSession
 
-__all__ = ["midi_to_audio", "render_parts_audio"]
+__all__ = ["midi_to_audio", "render_parts_audio", "render_audio_stream", "open_render_session", "FluidSynthSession"]
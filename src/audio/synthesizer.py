@@ -1,9 +1,32 @@
 """MIDI to Audio 합성 모듈 (FluidSynth 사용)"""
 
+import contextlib
+import functools
+import re
+import shutil
 import subprocess
 import os
+import threading
+import wave
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import mido
+
+from src.cache import cache_enabled, copy_atomic, file_digest, get_cache_dir
+
+# pyfluidsynth가 있으면 SoundFont를 한 번만 로드하여 재사용
+try:
+    import fluidsynth as pyfluidsynth
+except (ImportError, OSError):
+    pyfluidsynth = None
+
+# lameenc가 있으면 MP3를 프로세스 내에서 인코딩 (없으면 lame CLI 사용)
+try:
+    import lameenc
+except ImportError:
+    lameenc = None
 
 
 # 기본 SoundFont 경로들 (우선순위 순)
@@ -14,32 +37,73 @@ DEFAULT_SOUNDFONTS = [
     "/usr/share/soundfonts/FluidR3_GM.sf2",
 ]
 
+# Homebrew fluid-synth 설치 디렉토리 (버전별 하위 디렉토리에 SoundFont 포함)
+HOMEBREW_FLUIDSYNTH_DIR = "/opt/homebrew/Cellar/fluid-synth"
+
+# 곡 종료 후 잔향(release)을 위해 추가로 렌더링할 시간 (초)
+RELEASE_TAIL_SECONDS = 2.0
+
+# pyfluidsynth 렌더링 시 한 번에 생성할 샘플 프레임 수
+RENDER_BLOCK_FRAMES = 4096
+
+# MP3 비트레이트 (kbps)
+MP3_BITRATE = 192
+
+# 지원하는 MP3 인코더
+# - lame: 기본값, 심리음향 모델 사용 (고품질)
+# - shine: 고정소수점 인코더, LAME보다 수 배 빠름 (연습용 음원에 충분한 품질)
+MP3_ENCODERS = ("lame", "shine")
+
+
+def _scandir_sorted(directory: str) -> List[os.DirEntry]:
+    """디렉토리 항목을 이름순으로 반환 (없거나 읽을 수 없으면 빈 리스트)"""
+    try:
+        with os.scandir(directory) as it:
+            return sorted(it, key=lambda e: e.name)
+    except OSError:
+        return []
+
+
+def _find_sf2(root: str, max_depth: int) -> Optional[Path]:
+    """root 아래를 너비 우선으로 탐색하여 처음 발견한 .sf2 파일 반환 (깊이 제한)"""
+    level = [root]
+    for depth in range(max_depth + 1):
+        subdirs = []
+        for directory in level:
+            for entry in _scandir_sorted(directory):
+                if entry.name.endswith(".sf2") and entry.is_file():
+                    return Path(entry.path)
+                if depth < max_depth and entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+        level = subdirs
+    return None
+
 
+@functools.lru_cache(maxsize=1)
 def find_soundfont() -> Optional[Path]:
     """
-    시스템에서 사용 가능한 SoundFont 찾기
+    시스템에서 사용 가능한 SoundFont 찾기 (결과는 프로세스 내에서 캐시됨)
 
     Returns:
         SoundFont 파일 경로 (없으면 None)
     """
     # 프로젝트 내 SoundFont 확인
-    project_sf = Path(__file__).parent.parent.parent / "soundfonts"
-    if project_sf.exists():
-        for sf in project_sf.glob("*.sf2"):
-            return sf
+    project_sf = os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, "soundfonts")
+    found = _find_sf2(os.path.normpath(project_sf), max_depth=0)
+    if found:
+        return found
 
-    # 시스템 SoundFont 확인
+    # 시스템 SoundFont 확인 (후보 디렉토리마다 scandir 한 번)
+    dir_entries: Dict[str, set] = {}
     for sf_path in DEFAULT_SOUNDFONTS:
-        if Path(sf_path).exists():
+        parent, name = os.path.split(sf_path)
+        if parent not in dir_entries:
+            dir_entries[parent] = {e.name for e in _scandir_sorted(parent)}
+        if name in dir_entries[parent]:
             return Path(sf_path)
 
     # Homebrew로 설치된 SoundFont 검색
-    homebrew_sf = Path("/opt/homebrew/Cellar/fluid-synth")
-    if homebrew_sf.exists():
-        for sf in homebrew_sf.rglob("*.sf2"):
-            return sf
-
-    return None
+    return _find_sf2(HOMEBREW_FLUIDSYNTH_DIR, max_depth=4)
 
 
 def download_soundfont(output_dir: str | Path) -> Path:
@@ -72,85 +136,485 @@ def download_soundfont(output_dir: str | Path) -> Path:
     return sf_path
 
 
+def resolve_soundfont(soundfont: Optional[str | Path] = None) -> Path:
+    """
+    사용할 SoundFont 경로 결정 (없으면 자동 탐색 후 다운로드)
+
+    Args:
+        soundfont: SoundFont 파일 경로 (None이면 자동 탐색)
+
+    Returns:
+        존재하는 SoundFont 파일 경로
+    """
+    if soundfont is None:
+        soundfont = find_soundfont()
+        if soundfont is None:
+            # SoundFont 다운로드
+            soundfont = download_soundfont(Path(__file__).parent.parent.parent / "soundfonts")
+            # 캐시된 "없음" 결과 무효화
+            find_soundfont.cache_clear()
+
+    soundfont = Path(soundfont)
+    if not soundfont.exists():
+        raise FileNotFoundError(f"SoundFont를 찾을 수 없습니다: {soundfont}")
+
+    return soundfont
+
+
+@functools.lru_cache(maxsize=1)
+def fluidsynth_version() -> Tuple[int, ...]:
+    """
+    설치된 fluidsynth CLI 버전 확인 (결과는 프로세스 내에서 캐시됨)
+
+    Returns:
+        (major, minor, patch) 튜플 (확인 실패 시 빈 튜플)
+    """
+    try:
+        result = subprocess.run(
+            ["fluidsynth", "--version"],
+            capture_output=True,
+            text=True,
+            timeout=10
+        )
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return ()
+
+    match = re.search(r"version (\d+)\.(\d+)\.(\d+)", result.stdout)
+    return tuple(int(v) for v in match.groups()) if match else ()
+
+
+def _fluidsynth_cmd(
+    midi_path: Path,
+    output: str,
+    soundfont: Path,
+    sample_rate: int,
+    gain: float,
+    cpu_cores: int = 1
+) -> List[str]:
+    """
+    fluidsynth CLI 렌더링 명령 생성
+
+    -F(fast-render)로 실시간 대기 없이 렌더링하고, 오프라인 연습 음원에
+    불필요한 리버브/코러스는 끈다.
+    output이 "-"이면 16-bit 스테레오 raw PCM을 stdout으로 출력
+    """
+    cmd = [
+        "fluidsynth",
+        "-ni",  # No shell, non-interactive
+        "-g", str(gain),
+        "-r", str(sample_rate),
+        "-R", "0",  # 리버브 끄기
+        "-C", "0",  # 코러스 끄기
+    ]
+    # 멀티코어 합성은 FluidSynth 2.x부터 안정적
+    if cpu_cores > 1 and fluidsynth_version() >= (2, 0, 0):
+        cmd += ["-o", f"synth.cpu-cores={cpu_cores}"]
+    if output == "-":
+        cmd += ["-T", "raw", "-O", "s16"]
+    cmd += ["-F", output, str(soundfont), str(midi_path)]
+    return cmd
+
+
+def _run_tool(cmd: List[str], capture_stdout: bool = False) -> bytes:
+    """
+    외부 도구 실행
+
+    stdout은 필요할 때만 캡처하고(기본은 버림), stderr만 파이프로 받아 실패 시
+    오류 메시지로 사용한다. 파이썬이 만드는 fd는 기본적으로 상속되지 않으므로
+    (PEP 446) close_fds=False로 fd 정리 비용을 생략한다.
+
+    Args:
+        cmd: 실행할 명령
+        capture_stdout: stdout을 캡처하여 반환할지 여부
+
+    Returns:
+        캡처한 stdout (capture_stdout=False면 빈 바이트)
+    """
+    try:
+        result = subprocess.run(
+            cmd,
+            check=True,
+            stdout=subprocess.PIPE if capture_stdout else subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            close_fds=False
+        )
+    except subprocess.CalledProcessError as e:
+        message = e.stderr.decode(errors="replace").strip() if e.stderr else ""
+        raise RuntimeError(f"{cmd[0]} 실행 실패 (코드 {e.returncode}): {message}") from e
+
+    return result.stdout or b""
+
+
+def _lame_raw_cmd(output_path: Path, sample_rate: int) -> List[str]:
+    """stdin의 16-bit 스테레오 raw PCM을 MP3로 인코딩하는 lame 명령 생성"""
+    return [
+        "lame",
+        "--quiet",  # 진행 상황 출력 생략 (stderr 파이프가 차지 않도록)
+        "-r",  # raw PCM 입력
+        "-s", str(sample_rate / 1000),  # kHz 단위
+        "--bitwidth", "16",
+        "--signed",
+        "--little-endian",
+        "-b", str(MP3_BITRATE),
+        "-",
+        str(output_path)
+    ]
+
+
+def _encode_mp3(pcm: bytes, output_path: Path, sample_rate: int) -> None:
+    """16-bit 스테레오 PCM을 lameenc로 인코딩하여 MP3 파일로 저장"""
+    encoder = lameenc.Encoder()
+    encoder.set_bit_rate(MP3_BITRATE)
+    encoder.set_in_sample_rate(sample_rate)
+    encoder.set_channels(2)
+    encoder.set_quality(5)
+
+    with open(output_path, "wb") as f:
+        f.write(encoder.encode(pcm))
+        f.write(encoder.flush())
+
+
+class FluidSynthSession:
+    """
+    SoundFont를 한 번만 로드하여 여러 MIDI 파일을 렌더링하는 세션
+
+    pyfluidsynth가 설치되어 있으면 Synth 인스턴스 하나를 재사용하므로
+    SoundFont 로드 비용이 파트 수와 무관하게 한 번만 발생한다.
+    pyfluidsynth가 없으면 파일마다 fluidsynth CLI를 실행한다.
+
+    Example:
+        with FluidSynthSession() as session:
+            session.render(midi_path, wav_path)
+    """
+
+    def __init__(
+        self,
+        soundfont: Optional[str | Path] = None,
+        sample_rate: int = 44100,
+        gain: float = 1.0,
+        cpu_cores: Optional[int] = None
+    ):
+        self.soundfont = resolve_soundfont(soundfont)
+        self.sample_rate = sample_rate
+        self.gain = gain
+        self.cpu_cores = cpu_cores or os.cpu_count() or 1
+        self._synth = None
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "FluidSynthSession":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def open(self) -> None:
+        """Synth 생성 및 SoundFont 로드 (pyfluidsynth가 없으면 아무것도 하지 않음)"""
+        if pyfluidsynth is None or self._synth is not None:
+            return
+
+        # synth.cpu-cores 등은 Synth 생성 시점에만 반영되므로 생성자 설정으로 전달
+        # (player.timing-source=sample: 실시간 대기 없이 샘플 생성 속도에 맞춰 MIDI 플레이어 진행)
+        synth = pyfluidsynth.Synth(
+            gain=self.gain,
+            samplerate=float(self.sample_rate),
+            **{
+                "player.timing-source": "sample",
+                "synth.reverb.active": 0,
+                "synth.chorus.active": 0,
+                "synth.cpu-cores": self.cpu_cores,
+            }
+        )
+
+        if synth.sfload(str(self.soundfont)) == -1:
+            synth.delete()
+            raise RuntimeError(f"SoundFont 로드 실패: {self.soundfont}")
+
+        self._synth = synth
+
+    def close(self) -> None:
+        """Synth 해제"""
+        if self._synth is not None:
+            self._synth.delete()
+            self._synth = None
+
+    def _cli_cmd(self, midi_path: Path, output: str) -> List[str]:
+        """세션 설정으로 fluidsynth CLI 명령 생성"""
+        return _fluidsynth_cmd(
+            midi_path, output, self.soundfont, self.sample_rate, self.gain, self.cpu_cores
+        )
+
+    def _synth_blocks(self, midi_path: Path):
+        """로드된 Synth로 MIDI 파일을 재생하며 PCM 블록을 순서대로 생성"""
+        duration = mido.MidiFile(str(midi_path)).length + RELEASE_TAIL_SECONDS
+        remaining = int(duration * self.sample_rate)
+
+        self._synth.play_midi_file(str(midi_path))
+        try:
+            while remaining > 0:
+                frames = min(remaining, RENDER_BLOCK_FRAMES)
+                yield self._synth.get_samples(frames).tobytes()
+                remaining -= frames
+        finally:
+            self._synth.play_midi_stop()
+            # 다음 파트에 이전 파트의 음이 남지 않도록 초기화
+            self._synth.system_reset()
+
+    def render(self, midi_path: str | Path, wav_path: str | Path) -> Path:
+        """
+        MIDI 파일 하나를 WAV로 렌더링
+
+        Args:
+            midi_path: MIDI 파일 경로
+            wav_path: 출력 WAV 파일 경로
+
+        Returns:
+            생성된 WAV 파일 경로
+        """
+        midi_path = Path(midi_path)
+        wav_path = Path(wav_path)
+
+        if self._synth is None:
+            _run_tool(self._cli_cmd(midi_path, str(wav_path)))
+            return wav_path
+
+        # Synth는 스레드 안전하지 않으므로 한 번에 한 파일씩 렌더링
+        with self._lock:
+            with wave.open(str(wav_path), "wb") as wf:
+                wf.setnchannels(2)
+                wf.setsampwidth(2)  # 16-bit
+                wf.setframerate(self.sample_rate)
+
+                for block in self._synth_blocks(midi_path):
+                    wf.writeframes(block)
+
+        return wav_path
+
+    def render_pcm(self, midi_path: str | Path) -> bytes:
+        """
+        MIDI 파일 하나를 16-bit 스테레오 PCM 바이트로 렌더링 (중간 파일 없음)
+
+        Args:
+            midi_path: MIDI 파일 경로
+
+        Returns:
+            인터리브된 16-bit little-endian 스테레오 PCM
+        """
+        midi_path = Path(midi_path)
+
+        if self._synth is None:
+            return _run_tool(self._cli_cmd(midi_path, "-"), capture_stdout=True)
+
+        with self._lock:
+            return b"".join(self._synth_blocks(midi_path))
+
+    def render_to_pipe(self, midi_path: str | Path, cmd: List[str]) -> None:
+        """
+        MIDI 파일을 렌더링하면서 PCM을 외부 프로세스의 stdin으로 바로 전달
+
+        중간 WAV 파일 없이 렌더링과 인코딩이 파이프로 동시에 진행된다.
+
+        Args:
+            midi_path: MIDI 파일 경로
+            cmd: stdin으로 16-bit 스테레오 raw PCM을 받는 명령 (예: lame)
+        """
+        midi_path = Path(midi_path)
+        producer = None
+
+        if self._synth is None:
+            # fluidsynth stdout → 인코더 stdin
+            producer = subprocess.Popen(
+                self._cli_cmd(midi_path, "-"),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                close_fds=False
+            )
+            try:
+                consumer = subprocess.Popen(
+                    cmd,
+                    stdin=producer.stdout,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
+                    close_fds=False
+                )
+            except OSError:
+                producer.kill()
+                producer.wait()
+                raise
+            # 인코더가 먼저 종료되면 fluidsynth가 SIGPIPE를 받도록 부모 쪽 핸들 닫기
+            producer.stdout.close()
+            _, stderr = consumer.communicate()
+            producer.wait()
+        else:
+            consumer = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                close_fds=False
+            )
+            with self._lock:
+                try:
+                    for block in self._synth_blocks(midi_path):
+                        consumer.stdin.write(block)
+                finally:
+                    consumer.stdin.close()
+            stderr = consumer.stderr.read()
+            consumer.wait()
+            consumer.stderr.close()
+
+        if producer is not None and producer.returncode != 0:
+            raise RuntimeError(f"fluidsynth 실행 실패 (코드 {producer.returncode})")
+        if consumer.returncode != 0:
+            message = stderr.decode(errors="replace").strip()
+            raise RuntimeError(f"{cmd[0]} 실행 실패 (코드 {consumer.returncode}): {message}")
+
+
+def has_notes(midi_path: str | Path) -> bool:
+    """
+    MIDI 파일에 소리 나는 음표(note_on, velocity > 0)가 있는지 확인
+
+    Args:
+        midi_path: MIDI 파일 경로
+
+    Returns:
+        음표가 하나라도 있으면 True (파일을 읽을 수 없으면 렌더링에 맡기도록 True)
+    """
+    try:
+        mf = mido.MidiFile(str(midi_path))
+    except (OSError, ValueError, EOFError):
+        return True
+
+    return any(
+        msg.type == "note_on" and msg.velocity > 0
+        for track in mf.tracks
+        for msg in track
+    )
+
+
 def midi_to_audio(
     midi_path: str | Path,
     output_path: str | Path,
     soundfont: Optional[str | Path] = None,
     sample_rate: int = 44100,
-    gain: float = 1.0
+    gain: float = 1.0,
+    session: Optional[FluidSynthSession] = None,
+    mp3_encoder: str = "lame",
+    use_cache: bool = True
 ) -> Path:
     """
     MIDI 파일을 오디오 파일로 변환
 
+    같은 MIDI/SoundFont/설정으로 렌더링한 결과는 디스크(~/.cache/pdf-score-converter/audio)에
+    캐시되어 다시 렌더링하지 않고 복사한다.
+
     Args:
         midi_path: MIDI 파일 경로
         output_path: 출력 오디오 파일 경로 (.wav 또는 .mp3)
         soundfont: SoundFont 파일 경로 (None이면 자동 탐색)
         sample_rate: 샘플레이트 (기본 44100Hz)
         gain: 볼륨 게인 (기본 1.0)
+        session: 재사용할 FluidSynthSession (지정하면 soundfont/sample_rate/gain 대신 세션 설정 사용)
+        mp3_encoder: MP3 인코더 ("lame" 또는 "shine")
+        use_cache: False면 오디오 캐시를 사용하지 않음
 
     Returns:
         생성된 오디오 파일 경로
     """
-    midi_path = Path(midi_path)
-    output_path = Path(output_path)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+    if mp3_encoder not in MP3_ENCODERS:
+        raise ValueError(f"지원하지 않는 MP3 인코더: {mp3_encoder}")
+
+    # 파트마다 호출되므로 경로는 문자열로 다루고 렌더링 단계에서만 Path로 변환
+    midi_path = os.fspath(midi_path)
+    output_path = os.fspath(output_path)
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    output_suffix = os.path.splitext(output_path)[1].lower()
+    mp3_encoder = _resolve_mp3_encoder(output_suffix, mp3_encoder)
+
+    if not (use_cache and cache_enabled()):
+        if session is None:
+            session = FluidSynthSession(soundfont, sample_rate=sample_rate, gain=gain)
+        return _render_audio(Path(midi_path), Path(output_path), session, mp3_encoder)
+
+    if session is not None:
+        soundfont, sample_rate, gain = session.soundfont, session.sample_rate, session.gain
+    else:
+        soundfont = resolve_soundfont(soundfont)
+
+    # SoundFont는 용량이 크므로 내용 대신 경로/수정시각/크기로 식별
+    sf_stat = os.stat(soundfont)
+    settings = f"{soundfont}|{sf_stat.st_mtime_ns}|{sf_stat.st_size}|{sample_rate}|{gain}"
+    if output_suffix == ".mp3":
+        # 인코더는 MP3 결과에만 영향을 줌 (실제로 사용할 인코더 기준)
+        settings += f"|{mp3_encoder}"
+    cache_path = get_cache_dir("audio") / f"{file_digest(midi_path, settings.encode())}{output_suffix}"
+
+    if cache_path.exists():
+        shutil.copyfile(cache_path, output_path)
+        return Path(output_path)
+
+    if session is None:
+        session = FluidSynthSession(soundfont, sample_rate=sample_rate, gain=gain)
+    rendered = _render_audio(Path(midi_path), Path(output_path), session, mp3_encoder)
+
+    # 인코더가 없어 WAV로 대체 저장된 경우는 캐시하지 않음
+    if rendered.suffix.lower() == output_suffix:
+        try:
+            copy_atomic(rendered, cache_path)
+        except OSError as e:
+            print(f"  경고: 오디오 캐시 저장 실패 - {e}")
 
-    # SoundFont 찾기
-    if soundfont is None:
-        soundfont = find_soundfont()
-        if soundfont is None:
-            # SoundFont 다운로드
-            soundfont = download_soundfont(Path(__file__).parent.parent.parent / "soundfonts")
+    return rendered
 
-    soundfont = Path(soundfont)
-    if not soundfont.exists():
-        raise FileNotFoundError(f"SoundFont를 찾을 수 없습니다: {soundfont}")
 
-    # 출력 형식 결정
+def _resolve_mp3_encoder(output_suffix: str, mp3_encoder: str) -> str:
+    """실제로 사용할 MP3 인코더 (shineenc가 없으면 lame으로 대체)"""
+    if output_suffix == ".mp3" and mp3_encoder == "shine" and not shutil.which("shineenc"):
+        print("  경고: shineenc가 설치되지 않아 LAME으로 인코딩함")
+        return "lame"
+    return mp3_encoder
+
+
+def _render_audio(
+    midi_path: Path,
+    output_path: Path,
+    session: FluidSynthSession,
+    mp3_encoder: str
+) -> Path:
+    """
+    세션으로 MIDI를 렌더링하여 출력 형식에 맞게 저장 (캐시 미사용)
+
+    mp3_encoder는 _resolve_mp3_encoder로 대체 여부를 정한 값을 넘긴다.
+    """
     output_suffix = output_path.suffix.lower()
 
     if output_suffix == ".wav":
         # FluidSynth로 직접 WAV 생성
-        cmd = [
-            "fluidsynth",
-            "-ni",  # No shell, non-interactive
-            "-g", str(gain),
-            "-r", str(sample_rate),
-            "-F", str(output_path),
-            str(soundfont),
-            str(midi_path)
-        ]
-        subprocess.run(cmd, check=True, capture_output=True)
+        session.render(midi_path, output_path)
 
-    elif output_suffix == ".mp3":
-        # WAV로 먼저 생성 후 MP3로 변환
+    elif output_suffix == ".mp3" and mp3_encoder == "shine":
+        # shineenc는 WAV 입력만 받으므로 WAV 생성 후 변환
         wav_path = output_path.with_suffix('.wav')
-
-        # WAV 생성
-        cmd = [
-            "fluidsynth",
-            "-ni",
-            "-g", str(gain),
-            "-r", str(sample_rate),
-            "-F", str(wav_path),
-            str(soundfont),
-            str(midi_path)
-        ]
-        subprocess.run(cmd, check=True, capture_output=True)
-
-        # MP3로 변환 (lame 사용)
+        session.render(midi_path, wav_path)
         try:
-            subprocess.run(
-                ["lame", "-b", "192", str(wav_path), str(output_path)],
-                check=True,
-                capture_output=True
-            )
-            wav_path.unlink()  # WAV 파일 삭제
-        except FileNotFoundError:
-            # lame이 없으면 WAV 유지
-            print("  경고: lame이 설치되지 않아 WAV로 저장됨")
-            output_path = wav_path
+            _run_tool(["shineenc", "-b", str(MP3_BITRATE), str(wav_path), str(output_path)])
+        finally:
+            wav_path.unlink(missing_ok=True)
+
+    elif output_suffix == ".mp3" and lameenc is not None:
+        # 메모리에서 바로 MP3 인코딩 (중간 WAV 파일 없음)
+        pcm = session.render_pcm(midi_path)
+        _encode_mp3(pcm, output_path, session.sample_rate)
+
+    elif output_suffix == ".mp3" and shutil.which("lame"):
+        # FluidSynth 출력을 lame으로 바로 파이프 (중간 WAV 파일 없음)
+        session.render_to_pipe(midi_path, _lame_raw_cmd(output_path, session.sample_rate))
+
+    elif output_suffix == ".mp3":
+        # lame이 없으면 WAV로 저장
+        print("  경고: lame이 설치되지 않아 WAV로 저장됨")
+        output_path = output_path.with_suffix('.wav')
+        session.render(midi_path, output_path)
 
     else:
         raise ValueError(f"지원하지 않는 오디오 형식: {output_suffix}")
@@ -162,39 +626,151 @@ def render_parts_audio(
     midi_dir: str | Path,
     output_dir: str | Path,
     format: str = "wav",
-    soundfont: Optional[str | Path] = None
+    soundfont: Optional[str | Path] = None,
+    mp3_encoder: str = "lame",
+    use_cache: bool = True
 ) -> Dict[str, Path]:
     """
     디렉토리 내 모든 MIDI 파일을 오디오로 변환
 
+    모든 파트는 하나의 FluidSynthSession으로 렌더링된다. pyfluidsynth가 있으면
+    SoundFont를 한 번만 로드한 Synth로 파트를 차례로 렌더링하고, 인코딩은 병렬로
+    진행한다. (파트를 채널별로 합친 MIDI를 한 번에 렌더링한 뒤 채널별로 나누는
+    방식은 FluidSynth 파일 렌더러가 스테레오 믹스 하나만 출력하므로 사용하지 않음)
+
     Args:
         midi_dir: MIDI 파일 디렉토리
         output_dir: 오디오 출력 디렉토리
         format: 출력 형식 (wav 또는 mp3)
         soundfont: SoundFont 파일 경로
+        mp3_encoder: MP3 인코더 ("lame" 또는 "shine")
+        use_cache: False면 오디오 캐시를 사용하지 않음
 
     Returns:
         파트명 → 오디오 파일 경로 딕셔너리
     """
-    midi_dir = Path(midi_dir)
-    output_dir = Path(output_dir)
-    output_dir.mkdir(parents=True, exist_ok=True)
+    # 디렉토리는 scandir로 한 번만 읽음
+    with os.scandir(midi_dir) as it:
+        entries = sorted(
+            (e for e in it if e.name.endswith(".mid") and e.is_file()),
+            key=lambda e: e.name
+        )
+    midi_files = [(e.name[:-len(".mid")], e.path) for e in entries]
+
+    if not midi_files:
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+        return {}
+
+    return render_audio_stream(
+        midi_files, output_dir, format=format, soundfont=soundfont,
+        mp3_encoder=mp3_encoder, use_cache=use_cache,
+        max_workers=min(len(midi_files), os.cpu_count() or 1)
+    )
 
-    results = {}
 
-    for midi_file in sorted(midi_dir.glob("*.mid")):
-        part_name = midi_file.stem
-        audio_path = output_dir / f"{part_name}.{format}"
+def open_render_session(
+    soundfont: Optional[str | Path] = None,
+    max_workers: Optional[int] = None
+) -> FluidSynthSession:
+    """
+    render_audio_stream용 FluidSynth 세션을 만들고 SoundFont 로드
 
-        print(f"  렌더링 중: {midi_file.name} → {audio_path.name}")
+    SoundFont 탐색/다운로드/로드 실패는 여기서 예외로 드러나므로
+    호출자가 렌더링 파이프라인을 만들기 전에 오디오 사용 가능 여부를 확인할 수 있다.
 
-        try:
-            midi_to_audio(midi_file, audio_path, soundfont=soundfont)
-            results[part_name] = audio_path
-        except Exception as e:
-            print(f"  오류: {e}")
+    Args:
+        soundfont: SoundFont 파일 경로 (None이면 자동 탐색)
+        max_workers: 동시 렌더링 수 (None이면 CPU 코어 수)
+
+    Returns:
+        열린 세션 (사용 후 close 필요)
+    """
+    max_workers = max(1, max_workers or os.cpu_count() or 1)
+    # CLI 렌더링은 병렬로 실행되므로 코어를 나눠 쓰도록 작업당 코어 수 제한
+    cpu_cores = None if pyfluidsynth is not None else max(1, (os.cpu_count() or 1) // max_workers)
+    session = FluidSynthSession(soundfont, cpu_cores=cpu_cores)
+    session.open()
+    return session
+
+
+def render_audio_stream(
+    midi_files: Iterable[Tuple[str, str | Path]],
+    output_dir: str | Path,
+    format: str = "wav",
+    soundfont: Optional[str | Path] = None,
+    mp3_encoder: str = "lame",
+    use_cache: bool = True,
+    max_workers: Optional[int] = None,
+    session: Optional[FluidSynthSession] = None
+) -> Dict[str, Path]:
+    """
+    (파트명, MIDI 경로)를 받는 대로 오디오로 렌더링
 
-    return results
+    midi_files가 제너레이터면 항목이 만들어지는 즉시 렌더링을 시작하므로
+    MIDI 생성과 오디오 렌더링이 파트 단위로 겹쳐 실행된다.
+    (예: iter_parts_midi의 결과를 그대로 전달)
+
+    Args:
+        midi_files: (파트명, MIDI 파일 경로) 이터러블
+        output_dir: 오디오 출력 디렉토리
+        format: 출력 형식 (wav 또는 mp3)
+        soundfont: SoundFont 파일 경로
+        mp3_encoder: MP3 인코더 ("lame" 또는 "shine")
+        use_cache: False면 오디오 캐시를 사용하지 않음
+        max_workers: 동시 렌더링 수 (None이면 CPU 코어 수)
+        session: 미리 연 FluidSynth 세션 (None이면 open_render_session으로 만들고 끝나면 닫음)
+
+    Returns:
+        파트명 → 오디오 파일 경로 딕셔너리 (midi_files 순서)
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    out_str = os.fspath(output_dir)
+
+    results = {}
+    order = []
+    lock = threading.Lock()
+    max_workers = max(1, max_workers or os.cpu_count() or 1)
+
+    # SoundFont는 세션에서 한 번만 탐색/로드하여 모든 파트가 공유
+    if session is None:
+        session_context = open_render_session(soundfont, max_workers)
+    else:
+        session_context = contextlib.nullcontext(session)
+
+    with session_context as session:
+
+        def render_one(part_name: str, midi_path: str, audio_path: str) -> None:
+            print(f"  렌더링 중: {os.path.basename(midi_path)} → {os.path.basename(audio_path)}")
+
+            try:
+                rendered = midi_to_audio(
+                    midi_path, audio_path, session=session,
+                    mp3_encoder=mp3_encoder, use_cache=use_cache
+                )
+                with lock:
+                    results[part_name] = rendered
+            except Exception as e:
+                print(f"  오류: {e}")
+
+        # 파트별 렌더링은 서로 독립적이므로 병렬 실행
+        # (CLI 렌더링과 MP3 인코딩은 서브프로세스에서 블로킹되므로 스레드로 충분)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = []
+            for part_name, midi_path in midi_files:
+                midi_path = os.fspath(midi_path)
+                # OMR 오인식 등으로 음표가 없는 파트는 렌더링 생략
+                if not has_notes(midi_path):
+                    print(f"  건너뜀 (음표 없음): {os.path.basename(midi_path)}")
+                    continue
+                order.append(part_name)
+                audio_path = os.path.join(out_str, f"{part_name}.{format}")
+                futures.append(executor.submit(render_one, part_name, midi_path, audio_path))
+            for future in as_completed(futures):
+                future.result()
+
+    # 파트 순서를 입력 순으로 유지
+    return {name: results[name] for name in order if name in results}
 
 
 if __name__ == "__main__":
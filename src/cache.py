@@ -0,0 +1,136 @@
+"""디스크 캐시 공통 모듈
+
+변환 중간 결과를 ~/.cache/pdf-score-converter/ 아래에 저장하여
+같은 입력으로 다시 실행할 때 재사용한다.
+환경변수 CACHE_DISABLE을 설정하면 캐시를 사용하지 않는다.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+
+# 캐시 루트 디렉토리 (XDG_CACHE_HOME 우선)
+CACHE_ROOT = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "pdf-score-converter"
+
+# 찾아 둔 외부 도구(MuseScore, Audiveris) 경로 파일
+TOOLS_FILE = CACHE_ROOT / "tools.json"
+
+
+def cache_enabled() -> bool:
+    """CACHE_DISABLE 환경변수가 설정되지 않았으면 True"""
+    return not os.environ.get("CACHE_DISABLE")
+
+
+def get_cache_dir(name: str) -> Path:
+    """
+    이름별 캐시 디렉토리 반환 (없으면 생성)
+
+    Args:
+        name: 캐시 종류 (예: "scores")
+
+    Returns:
+        캐시 디렉토리 경로
+    """
+    cache_dir = CACHE_ROOT / name
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    return cache_dir
+
+
+def file_digest(file_path: str | Path, extra: bytes = b"") -> str:
+    """
+    파일 내용의 해시 키 계산 (blake2b, 128-bit)
+
+    Args:
+        file_path: 파일 경로
+        extra: 해시에 함께 포함할 추가 바이트 (설정값 등)
+
+    Returns:
+        16진수 해시 문자열
+    """
+    h = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    h.update(extra)
+    return h.hexdigest()
+
+
+def is_up_to_date(output_path: str | Path, input_path: str | Path) -> bool:
+    """출력 파일이 있고 입력 파일보다 나중에 수정되었으면 True (외부 도구 재실행 생략용)"""
+    try:
+        return os.stat(output_path).st_mtime >= os.stat(input_path).st_mtime
+    except OSError:
+        return False
+
+
+def _replace_from_temp(path: Path, write) -> None:
+    """
+    같은 디렉토리의 고유한 임시 파일에 write(임시 경로)로 쓴 뒤 path로 교체
+
+    같은 프로세스의 여러 스레드가 같은 키를 동시에 저장해도 임시 파일이 겹치지 않는다.
+    """
+    fd, tmp_path = tempfile.mkstemp(prefix=f"{path.name}.", suffix=".tmp", dir=path.parent)
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_path)
+        raise
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """임시 파일에 쓴 뒤 교체하여 동시 실행 중에도 깨진 캐시 파일이 보이지 않게 저장"""
+    _replace_from_temp(path, lambda tmp_path: Path(tmp_path).write_bytes(data))
+
+
+def copy_atomic(src: str | Path, path: Path) -> None:
+    """파일을 임시 이름으로 복사한 뒤 교체하여 저장 (write_atomic의 파일 복사 버전)"""
+    _replace_from_temp(path, lambda tmp_path: shutil.copyfile(src, tmp_path))
+
+
+def _read_tools() -> dict:
+    """tools.json 내용 (없거나 깨졌으면 빈 딕셔너리)"""
+    try:
+        tools = json.loads(TOOLS_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return tools if isinstance(tools, dict) else {}
+
+
+def load_tool_path(name: str) -> Optional[str]:
+    """
+    이전 실행에서 찾아 둔 외부 도구 경로 반환
+
+    Args:
+        name: 도구 이름 (예: "musescore")
+
+    Returns:
+        실행 파일 경로 (저장된 값이 없거나 더 이상 존재하지 않으면 None)
+    """
+    if not cache_enabled():
+        return None
+    path = _read_tools().get(name)
+    if path and (os.path.exists(path) or shutil.which(path)):
+        return path
+    return None
+
+
+def save_tool_path(name: str, path: str) -> None:
+    """찾은 외부 도구 경로를 tools.json에 저장"""
+    if not cache_enabled():
+        return
+    tools = _read_tools()
+    if tools.get(name) == path:
+        return
+    tools[name] = path
+    CACHE_ROOT.mkdir(parents=True, exist_ok=True)
+    write_atomic(TOOLS_FILE, json.dumps(tools, ensure_ascii=False, indent=2).encode("utf-8"))
+
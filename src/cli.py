@@ -5,6 +5,7 @@ PDF 합창 악보를 각 성부(SATB)별로 분리하고 MIDI/음원으로 변
 """
 
 import click
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, List
 
@@ -28,8 +29,14 @@ def cli():
 @click.option("--pdf/--no-pdf", "export_pdf", default=True, help="성부별 PDF 생성")
 @click.option("--format", "audio_format", type=click.Choice(["wav", "mp3"]),
               default="wav", help="오디오 형식")
+@click.option("--mp3-encoder", type=click.Choice(["lame", "shine"]), default="lame",
+              help="MP3 인코더 (shine: 더 빠름, 기본: lame)")
 @click.option("--dpi", default=200, help="PDF 변환 해상도 (기본: 200)")
 @click.option("--tempo", type=int, help="템포 BPM (기본: 원본 유지)")
+@click.option("--legacy-midi-export", is_flag=True,
+              help="music21 MIDI 변환기 사용 (기본: mido로 직접 작성)")
+@click.option("--no-audio-cache", is_flag=True,
+              help="렌더링된 오디오 캐시를 사용하지 않음")
 def convert(
     pdf_path: str,
     output_dir: Optional[str],
@@ -37,19 +44,30 @@ def convert(
     audio: bool,
     export_pdf: bool,
     audio_format: str,
+    mp3_encoder: str,
     dpi: int,
-    tempo: Optional[int]
+    tempo: Optional[int],
+    legacy_midi_export: bool,
+    no_audio_cache: bool
 ):
     """PDF 악보를 성부별 MIDI/오디오/PDF로 변환
 
     전체 파이프라인: PDF → 이미지 → OMR → MusicXML → 성부 분리 → MIDI/오디오/PDF
     """
     from src.omr import recognize_score, OMR_ENGINE
-    from src.converter import parse_musicxml, export_parts_midi
+    from src.converter import parse_musicxml, iter_parts_midi
     from src.converter.part_splitter import split_satb
-    from src.audio import render_parts_audio
+    from src.audio import open_render_session, render_audio_stream
     from src.pdf import export_parts_pdf
 
+    # 사용할 외부 도구 경로만 먼저 찾아 두어 이후 단계(OMR, PDF 스레드)에서는 조회만 하도록 함
+    if export_pdf:
+        from src.pdf import part_pdf
+        part_pdf.prefetch()
+    if OMR_ENGINE == "audiveris":
+        from src.omr import audiveris_wrapper
+        audiveris_wrapper.prefetch()
+
     pdf_path = Path(pdf_path)
 
     if output_dir is None:
@@ -94,47 +112,88 @@ def convert(
 
     click.echo(f"      ✓ {len(all_parts)}개 성부 분리 완료\n")
 
-    # 3단계: MIDI 생성
-    if midi:
-        click.echo("[3/5] MIDI 생성...")
-        midi_dir = output_dir / "midi"
-        try:
-            midi_results = export_parts_midi(parts_dir, midi_dir, tempo_bpm=tempo)
-            click.echo(f"      ✓ {len(midi_results)}개 MIDI 생성 완료\n")
-        except Exception as e:
-            click.echo(f"      ✗ MIDI 생성 실패: {e}", err=True)
-            midi_results = {}
-    else:
-        click.echo("[3/5] MIDI 생성 건너뜀\n")
-        midi_results = {}
+    # 3~5단계는 겹쳐서 실행:
+    # 성부별 PDF는 별도 스레드에서 만들고, 오디오는 MIDI 변환이 끝난 파트부터 바로 렌더링
+    with ThreadPoolExecutor(max_workers=1) as pdf_executor:
+        pdf_output_dir = output_dir / "pdf"
+        pdf_future = pdf_executor.submit(export_parts_pdf, parts_dir, pdf_output_dir) if export_pdf else None
 
-    # 4단계: 오디오 렌더링
-    if audio and midi_results:
-        click.echo(f"[4/5] 오디오 렌더링 ({audio_format.upper()})...")
-        audio_dir = output_dir / "audio"
-        try:
-            audio_results = render_parts_audio(midi_dir, audio_dir, format=audio_format)
-            click.echo(f"      ✓ {len(audio_results)}개 오디오 생성 완료\n")
-        except Exception as e:
-            click.echo(f"      ✗ 오디오 생성 실패: {e}", err=True)
-            audio_results = {}
-    else:
-        click.echo("[4/5] 오디오 렌더링 건너뜀\n")
+        # 3단계: MIDI 생성 (+ 4단계: 오디오 렌더링)
+        midi_results = {}
         audio_results = {}
-
-    # 5단계: 성부별 PDF 생성
-    if export_pdf:
-        click.echo("[5/5] 성부별 PDF 생성...")
-        pdf_output_dir = output_dir / "pdf"
-        try:
-            pdf_results = export_parts_pdf(parts_dir, pdf_output_dir)
-            click.echo(f"      ✓ {len(pdf_results)}개 PDF 생성 완료\n")
-        except Exception as e:
-            click.echo(f"      ✗ PDF 생성 실패: {e}", err=True)
+        midi_errors = []
+
+        def midi_stream():
+            try:
+                for part_name, midi_path in iter_parts_midi(
+                    parts_dir, midi_dir, tempo_bpm=tempo, legacy=legacy_midi_export
+                ):
+                    midi_results[part_name] = midi_path
+                    yield part_name, midi_path
+            except Exception as e:
+                midi_errors.append(e)
+
+        if midi:
+            midi_dir = output_dir / "midi"
+            click.echo("[3/5] MIDI 생성...")
+
+            # SoundFont 탐색/로드는 파이프라인을 만들기 전에 확인
+            # (실패해도 MIDI 생성은 오디오 없이 계속 진행)
+            audio_session = None
+            audio_failed = False
+            # 렌더링할 파트가 없으면 SoundFont 탐색(다운로드 포함)도 하지 않음
+            has_parts = any(parts_dir.glob("*.musicxml"))
+            if audio and has_parts:
+                click.echo(f"[4/5] 오디오 렌더링 ({audio_format.upper()}, MIDI가 완성된 파트부터)...")
+                try:
+                    audio_session = open_render_session()
+                except Exception as e:
+                    click.echo(f"      ✗ 오디오 생성 실패: {e}", err=True)
+                    audio_failed = True
+
+            midi_items = midi_stream()
+            if audio_session is not None:
+                audio_dir = output_dir / "audio"
+                try:
+                    audio_results = render_audio_stream(
+                        midi_items, audio_dir, format=audio_format, mp3_encoder=mp3_encoder,
+                        use_cache=not no_audio_cache, session=audio_session
+                    )
+                except Exception as e:
+                    click.echo(f"      ✗ 오디오 생성 실패: {e}", err=True)
+                    audio_failed = True
+                finally:
+                    audio_session.close()
+
+            # 오디오 없이 실행하거나 렌더링이 중간에 실패했으면 남은 MIDI 변환을 마저 실행
+            for _ in midi_items:
+                pass
+
+            if midi_errors:
+                click.echo(f"      ✗ MIDI 생성 실패: {midi_errors[0]}", err=True)
+            click.echo(f"      ✓ {len(midi_results)}개 MIDI 생성 완료")
+            if not (audio and has_parts):
+                click.echo("[4/5] 오디오 렌더링 건너뜀\n")
+            elif not audio_failed:
+                click.echo(f"      ✓ {len(audio_results)}개 오디오 생성 완료\n")
+            else:
+                click.echo("")
+        else:
+            click.echo("[3/5] MIDI 생성 건너뜀")
+            click.echo("[4/5] 오디오 렌더링 건너뜀\n")
+
+        # 5단계: 성부별 PDF 생성
+        if pdf_future is not None:
+            click.echo("[5/5] 성부별 PDF 생성...")
+            try:
+                pdf_results = pdf_future.result()
+                click.echo(f"      ✓ {len(pdf_results)}개 PDF 생성 완료\n")
+            except Exception as e:
+                click.echo(f"      ✗ PDF 생성 실패: {e}", err=True)
+                pdf_results = {}
+        else:
+            click.echo("[5/5] PDF 생성 건너뜀\n")
             pdf_results = {}
-    else:
-        click.echo("[5/5] PDF 생성 건너뜀\n")
-        pdf_results = {}
 
     # 결과 요약
     click.echo(f"{'='*60}")
@@ -154,14 +213,15 @@ def convert(
 @cli.command()
 @click.argument("pdf_path", type=click.Path(exists=True))
 @click.option("--dpi", default=200, help="PDF 변환 해상도")
-def analyze(pdf_path: str, dpi: int):
+@click.option("--deep", is_flag=True, help="music21로 전체 악보를 파싱하여 분석 (느림)")
+def analyze(pdf_path: str, dpi: int, deep: bool):
     """PDF 악보 구조 분석 (OMR 결과 미리보기)
 
     악보를 인식하고 파트 구조를 분석하여 표시합니다.
     """
     from src.omr import recognize_score
-    from src.converter import parse_musicxml, get_score_info
-    from src.converter.musicxml_parser import print_score_info
+    from src.converter import parse_musicxml, get_score_info_fast
+    from src.converter.musicxml_parser import print_score_info, print_info
 
     pdf_path = Path(pdf_path)
     output_dir = Path("/tmp") / f"analyze_{pdf_path.stem}"
@@ -179,8 +239,11 @@ def analyze(pdf_path: str, dpi: int):
     # 각 페이지 분석
     for i, mxml_path in enumerate(musicxml_paths, start=1):
         click.echo(f"\n--- 페이지 {i} ---")
-        score = parse_musicxml(mxml_path)
-        print_score_info(score)
+        if deep:
+            score = parse_musicxml(mxml_path)
+            print_score_info(score)
+        else:
+            print_info(get_score_info_fast(mxml_path))
 
 
 @cli.command()
@@ -217,7 +280,17 @@ def split(musicxml_path: str, output_dir: Optional[str]):
               help="출력 디렉토리")
 @click.option("--format", "audio_format", type=click.Choice(["wav", "mp3"]),
               default="wav", help="오디오 형식")
-def render(input_path: str, output_dir: Optional[str], audio_format: str):
+@click.option("--mp3-encoder", type=click.Choice(["lame", "shine"]), default="lame",
+              help="MP3 인코더 (shine: 더 빠름, 기본: lame)")
+@click.option("--no-audio-cache", is_flag=True,
+              help="렌더링된 오디오 캐시를 사용하지 않음")
+def render(
+    input_path: str,
+    output_dir: Optional[str],
+    audio_format: str,
+    mp3_encoder: str,
+    no_audio_cache: bool
+):
     """MIDI 파일을 오디오로 렌더링
 
     단일 MIDI 파일 또는 디렉토리 내 모든 MIDI 파일을 변환합니다.
@@ -233,7 +306,10 @@ def render(input_path: str, output_dir: Optional[str], audio_format: str):
             output_dir = Path(output_dir)
 
         click.echo(f"\n오디오 렌더링 중: {input_path}\n")
-        results = render_parts_audio(input_path, output_dir, format=audio_format)
+        results = render_parts_audio(
+            input_path, output_dir, format=audio_format, mp3_encoder=mp3_encoder,
+            use_cache=not no_audio_cache
+        )
         click.echo(f"\n✓ {len(results)}개 오디오 생성 완료")
     else:
         if output_dir is None:
@@ -244,7 +320,9 @@ def render(input_path: str, output_dir: Optional[str], audio_format: str):
             output_path = output_dir / f"{input_path.stem}.{audio_format}"
 
         click.echo(f"\n오디오 렌더링 중: {input_path.name}\n")
-        midi_to_audio(input_path, output_path)
+        output_path = midi_to_audio(
+            input_path, output_path, mp3_encoder=mp3_encoder, use_cache=not no_audio_cache
+        )
         click.echo(f"\n✓ 저장됨: {output_path}")
 
 
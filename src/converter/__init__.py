@@ -1,14 +1,16 @@
 """음악 변환 모듈"""
 
-from .musicxml_parser import parse_musicxml, get_score_info
+from .musicxml_parser import parse_musicxml, get_score_info, get_score_info_fast
 from .part_splitter import split_parts, extract_voice
-from .midi_export import export_midi, export_parts_midi
+from .midi_export import export_midi, export_parts_midi, iter_parts_midi
 
 __all__ = [
     "parse_musicxml",
     "get_score_info",
+    "get_score_info_fast",
     "split_parts",
     "extract_voice",
     "export_midi",
     "export_parts_midi",
+    "iter_parts_midi",
 ]
@@ -1,13 +1,24 @@
 """MIDI 내보내기 모듈"""
 
+import functools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import mido
 from music21 import stream, midi, tempo, instrument
 
 
 # 합창 음색 MIDI 프로그램 번호
 CHOIR_PROGRAM = 52  # Choir Aahs
 
+# mido 직접 작성 시 설정
+TICKS_PER_BEAT = 480
+DEFAULT_BPM = 120.0
+DEFAULT_VELOCITY = 90
+MIDI_CHANNELS = [c for c in range(16) if c != 9]  # 채널 10(인덱스 9)은 타악기
+
 
 def set_choir_instrument(score: stream.Score, program: int = CHOIR_PROGRAM) -> stream.Score:
     """
@@ -20,24 +31,212 @@ def set_choir_instrument(score: stream.Score, program: int = CHOIR_PROGRAM) -> s
     Returns:
         수정된 Score 객체
     """
+    _replace_instruments(score, program)
+    return score
+
+
+def _replace_instruments(score: stream.Score, program: int) -> List[Callable[[], None]]:
+    """
+    모든 파트의 악기를 지정한 프로그램으로 교체
+
+    Returns:
+        변경을 되돌리는 함수 리스트 (역순으로 호출)
+    """
+    undo = []
+
     for part in score.parts:
         # 기존 악기 제거
-        for inst in part.getElementsByClass(instrument.Instrument):
+        for inst in list(part.getElementsByClass(instrument.Instrument)):
+            offset = part.elementOffset(inst)
             part.remove(inst)
+            undo.append(functools.partial(part.insert, offset, inst))
 
         # 합창 악기 추가
         choir = instrument.Instrument()
         choir.midiProgram = program
         part.insert(0, choir)
+        undo.append(functools.partial(part.remove, choir))
 
-    return score
+    return undo
+
+
+def _replace_tempo(score: stream.Score, tempo_bpm: int) -> List[Callable[[], None]]:
+    """
+    악보의 모든 템포 표시를 하나의 템포로 교체
+
+    Returns:
+        변경을 되돌리는 함수 리스트 (역순으로 호출)
+    """
+    undo = []
+
+    # 기존 템포 제거 (원래 위치 기억)
+    for mm in list(score.recurse().getElementsByClass(tempo.MetronomeMark)):
+        site = mm.activeSite
+        offset = site.elementOffset(mm)
+        site.remove(mm)
+        undo.append(functools.partial(site.insert, offset, mm))
+
+    # 새 템포 추가
+    new_mm = tempo.MetronomeMark(number=tempo_bpm)
+    score.insert(0, new_mm)
+    undo.append(functools.partial(score.remove, new_mm))
+
+    return undo
+
+
+def _tempo_map(score: stream.Score, tempo_bpm: Optional[int]) -> List[Tuple[int, float]]:
+    """
+    (tick, 4분음표 BPM) 템포 목록 생성
+
+    tempo_bpm이 지정되면 그 템포 하나만 사용하고, 아니면 악보의 템포 표시를 사용
+    """
+    if tempo_bpm:
+        return [(0, float(tempo_bpm))]
+
+    tempos = {}
+    for mm in score.flatten().getElementsByClass(tempo.MetronomeMark):
+        bpm = mm.getQuarterBPM()
+        if bpm:
+            # 파트마다 같은 템포 표시가 중복되므로 tick 기준으로 하나만 유지
+            tempos[round(float(mm.offset) * TICKS_PER_BEAT)] = bpm
+
+    return sorted(tempos.items()) or [(0, DEFAULT_BPM)]
+
+
+def _part_note_events(part: stream.Stream, channel: int) -> List[Tuple[int, int, mido.Message]]:
+    """
+    파트의 음표를 (tick, 정렬순서, note_on/note_off 메시지) 목록으로 변환
+
+    붙임줄로 이어진 음은 하나의 음으로 합친다.
+    """
+    notes = []  # [시작 tick, 끝 tick, pitch, velocity]
+    open_ties = {}  # pitch → notes 인덱스
+
+    for n in part.flatten().notes:
+        quarter_length = float(n.duration.quarterLength)
+        if quarter_length <= 0:
+            continue  # 꾸밈음 등 길이 없는 음 제외
+
+        start = round(float(n.offset) * TICKS_PER_BEAT)
+        end = round((float(n.offset) + quarter_length) * TICKS_PER_BEAT)
+        velocity = n.volume.velocity or DEFAULT_VELOCITY
+        velocity = max(1, min(127, int(velocity)))
+        tie_type = n.tie.type if n.tie is not None else None
+
+        for p in n.pitches:
+            pitch = p.midi
+
+            if tie_type in ("stop", "continue") and pitch in open_ties:
+                # 붙임줄: 이전 음 연장
+                notes[open_ties[pitch]][1] = end
+                if tie_type == "stop":
+                    del open_ties[pitch]
+                continue
+
+            notes.append([start, end, pitch, velocity])
+            if tie_type == "start":
+                open_ties[pitch] = len(notes) - 1
+
+    events = []
+    for start, end, pitch, velocity in notes:
+        # 아주 짧은 음이 반올림으로 길이 0이 되면 note_off가 note_on보다 먼저 정렬되어
+        # 음이 끊기지 않으므로 최소 1 tick 길이를 보장
+        end = max(end, start + 1)
+        # 같은 tick에서는 note_off를 먼저 처리하여 재타건 음이 끊기지 않게 함
+        events.append((start, 1, mido.Message("note_on", channel=channel, note=pitch, velocity=velocity)))
+        events.append((end, 0, mido.Message("note_off", channel=channel, note=pitch, velocity=0)))
+
+    return events
+
+
+def _to_track(events: List[Tuple[int, int, mido.Message]], head: List[mido.Message]) -> mido.MidiTrack:
+    """절대 tick 이벤트 목록을 delta time 기반 MidiTrack으로 변환"""
+    track = mido.MidiTrack(head)
+    last_tick = 0
+
+    for tick, _, msg in sorted(events, key=lambda e: (e[0], e[1])):
+        track.append(msg.copy(time=tick - last_tick))
+        last_tick = tick
+
+    track.append(mido.MetaMessage("end_of_track", time=0))
+    return track
+
+
+def _export_midi_mido(
+    score: stream.Score,
+    output_path: Path,
+    tempo_bpm: Optional[int],
+    use_choir_sound: bool
+) -> None:
+    """music21 MIDI 변환 계층을 거치지 않고 mido로 직접 MIDI 파일 작성"""
+    mf = mido.MidiFile(type=1, ticks_per_beat=TICKS_PER_BEAT)
+
+    # 0번 트랙: 템포
+    tempo_events = [
+        (tick, 0, mido.MetaMessage("set_tempo", tempo=mido.bpm2tempo(bpm)))
+        for tick, bpm in _tempo_map(score, tempo_bpm)
+    ]
+    mf.tracks.append(_to_track(tempo_events, []))
+
+    # 파트별 트랙 (채널 10은 타악기이므로 제외)
+    parts = list(score.parts) or [score]
+    for i, part in enumerate(parts):
+        channel = MIDI_CHANNELS[i % len(MIDI_CHANNELS)]
+
+        if use_choir_sound:
+            program = CHOIR_PROGRAM
+        else:
+            inst = part.getInstrument(returnDefault=False)
+            program = inst.midiProgram if inst is not None and inst.midiProgram is not None else 0
+
+        head = [
+            mido.MetaMessage("track_name", name=part.partName or f"Part {i + 1}", time=0),
+            mido.Message("program_change", channel=channel, program=program, time=0),
+        ]
+        mf.tracks.append(_to_track(_part_note_events(part, channel), head))
+
+    mf.save(str(output_path))
+
+
+def _export_midi_music21(
+    score: stream.Score,
+    output_path: Path,
+    tempo_bpm: Optional[int],
+    use_choir_sound: bool
+) -> None:
+    """
+    music21 MIDI 변환기로 MIDI 파일 작성 (기존 방식)
+
+    템포/악기 변경은 원본 Score에 직접 적용한 뒤 저장 후 되돌린다
+    (전체 악보를 깊은 복사하지 않음).
+    """
+    undo = []
+    try:
+        # 템포 설정
+        if tempo_bpm:
+            undo += _replace_tempo(score, tempo_bpm)
+
+        # 합창 음색 설정
+        if use_choir_sound:
+            undo += _replace_instruments(score, CHOIR_PROGRAM)
+
+        # MIDI 파일로 저장
+        mf = midi.translate.music21ObjectToMidiFile(score)
+        mf.open(str(output_path), 'wb')
+        mf.write()
+        mf.close()
+    finally:
+        # 원본 악보 복원
+        for restore in reversed(undo):
+            restore()
 
 
 def export_midi(
     score: stream.Score,
     output_path: str | Path,
     tempo_bpm: Optional[int] = None,
-    use_choir_sound: bool = True
+    use_choir_sound: bool = True,
+    legacy: bool = False
 ) -> Path:
     """
     악보를 MIDI 파일로 내보내기
@@ -47,74 +246,148 @@ def export_midi(
         output_path: 출력 파일 경로
         tempo_bpm: 템포 (None이면 악보 원본 템포 사용)
         use_choir_sound: 합창 음색 사용 여부
+        legacy: True면 music21 MIDI 변환기 사용 (기본: mido로 직접 작성)
 
     Returns:
         생성된 MIDI 파일 경로
     """
     output_path = Path(output_path)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-
-    # 악보 복사 (원본 수정 방지)
-    score_copy = score.__deepcopy__()
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
 
-    # 템포 설정
-    if tempo_bpm:
-        # 기존 템포 제거
-        for t in score_copy.flatten().getElementsByClass(tempo.MetronomeMark):
-            score_copy.remove(t, recurse=True)
-        # 새 템포 추가
-        mm = tempo.MetronomeMark(number=tempo_bpm)
-        score_copy.insert(0, mm)
-
-    # 합창 음색 설정
-    if use_choir_sound:
-        set_choir_instrument(score_copy)
-
-    # MIDI 파일로 저장
-    mf = midi.translate.music21ObjectToMidiFile(score_copy)
-    mf.open(str(output_path), 'wb')
-    mf.write()
-    mf.close()
+    if legacy:
+        _export_midi_music21(score, output_path, tempo_bpm, use_choir_sound)
+    else:
+        _export_midi_mido(score, output_path, tempo_bpm, use_choir_sound)
 
     return output_path
 
 
+def _convert_one(
+    part_name: str,
+    xml_path: str,
+    midi_path: str,
+    tempo_bpm: Optional[int],
+    legacy: bool = False
+) -> Tuple[str, Path]:
+    """MusicXML 파일 하나를 MIDI로 변환 (프로세스 풀 작업 단위)"""
+    from .musicxml_parser import parse_musicxml
+
+    print(f"  변환 중: {os.path.basename(xml_path)} → {os.path.basename(midi_path)}")
+
+    score = parse_musicxml(xml_path)
+    export_midi(score, midi_path, tempo_bpm=tempo_bpm, legacy=legacy)
+
+    return part_name, Path(midi_path)
+
+
+def _mp_context():
+    """
+    프로세스 풀 시작 방식 (forkserver, 없으면 spawn)
+
+    CLI에서는 PDF 스레드와 FluidSynth가 이미 동작 중일 때 풀을 만들므로
+    멀티스레드 프로세스를 fork하지 않도록 한다.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _parts_midi_jobs(musicxml_dir: str | Path, output_dir: Path) -> List[Tuple[str, str, str]]:
+    """디렉토리의 MusicXML 파일별 (파트명, MusicXML 경로, MIDI 경로) 작업 목록 (파일명 순)"""
+    # 디렉토리는 scandir로 한 번만 읽고, 출력 경로는 문자열로 미리 계산
+    suffix = ".musicxml"
+    out_str = os.fspath(output_dir)
+    with os.scandir(musicxml_dir) as it:
+        entries = sorted(
+            (e for e in it if e.name.endswith(suffix) and e.is_file()),
+            key=lambda e: e.name
+        )
+
+    jobs = []
+    for entry in entries:
+        part_name = entry.name[:-len(suffix)]
+        jobs.append((part_name, entry.path, os.path.join(out_str, part_name + ".mid")))
+    return jobs
+
+
 def export_parts_midi(
     musicxml_dir: str | Path,
     output_dir: str | Path,
-    tempo_bpm: Optional[int] = None
+    tempo_bpm: Optional[int] = None,
+    legacy: bool = False
 ) -> Dict[str, Path]:
     """
     디렉토리 내 모든 MusicXML 파일을 MIDI로 변환
 
+    파일별 변환은 서로 독립적이므로 프로세스 풀에서 병렬로 처리
+    (music21 파싱은 순수 파이썬이라 GIL을 놓지 않으므로 스레드 대신 프로세스 사용)
+
     Args:
         musicxml_dir: MusicXML 파일 디렉토리
         output_dir: MIDI 출력 디렉토리
         tempo_bpm: 템포 (None이면 원본 사용)
+        legacy: True면 music21 MIDI 변환기 사용
 
     Returns:
         파트명 → MIDI 파일 경로 딕셔너리
     """
-    from music21 import converter
-
-    musicxml_dir = Path(musicxml_dir)
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    results = {}
+    jobs = _parts_midi_jobs(musicxml_dir, output_dir)
+    if not jobs:
+        return {}
+
+    if len(jobs) == 1:
+        # 파일이 하나면 프로세스 생성 비용을 피함
+        part_name, midi_path = _convert_one(*jobs[0], tempo_bpm, legacy)
+        return {part_name: midi_path}
+
+    max_workers = min(len(jobs), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=_mp_context()) as executor:
+        converted = executor.map(
+            _convert_one,
+            *zip(*jobs),
+            [tempo_bpm] * len(jobs),
+            [legacy] * len(jobs)
+        )
+        return dict(converted)
+
 
-    for xml_file in sorted(musicxml_dir.glob("*.musicxml")):
-        part_name = xml_file.stem
-        midi_path = output_dir / f"{part_name}.mid"
+def iter_parts_midi(
+    musicxml_dir: str | Path,
+    output_dir: str | Path,
+    tempo_bpm: Optional[int] = None,
+    legacy: bool = False
+) -> Iterator[Tuple[str, Path]]:
+    """
+    export_parts_midi와 같지만 변환이 끝나는 순서대로 결과를 하나씩 반환
+
+    오디오 렌더링 등 다음 단계가 전체 변환을 기다리지 않고
+    먼저 끝난 파트부터 시작할 수 있다.
 
-        print(f"  변환 중: {xml_file.name} → {midi_path.name}")
+    Args:
+        musicxml_dir: MusicXML 파일 디렉토리
+        output_dir: MIDI 출력 디렉토리
+        tempo_bpm: 템포 (None이면 원본 사용)
+        legacy: True면 music21 MIDI 변환기 사용
 
-        score = converter.parse(str(xml_file))
-        export_midi(score, midi_path, tempo_bpm=tempo_bpm)
+    Returns:
+        (파트명, MIDI 파일 경로) 이터레이터
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
 
-        results[part_name] = midi_path
+    jobs = _parts_midi_jobs(musicxml_dir, output_dir)
+    if len(jobs) <= 1:
+        for job in jobs:
+            yield _convert_one(*job, tempo_bpm, legacy)
+        return
 
-    return results
+    max_workers = min(len(jobs), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=_mp_context()) as executor:
+        futures = [executor.submit(_convert_one, *job, tempo_bpm, legacy) for job in jobs]
+        for future in as_completed(futures):
+            yield future.result()
 
 
 def create_combined_midi(
@@ -137,29 +410,47 @@ def create_combined_midi(
     Returns:
         생성된 MIDI 파일 경로
     """
-    from music21 import converter
-
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    combined_score = stream.Score()
+    combined = mido.MidiFile(type=1, ticks_per_beat=TICKS_PER_BEAT)
+
+    for index, (part_name, midi_path) in enumerate(part_midis.items()):
+        part_file = mido.MidiFile(str(midi_path))
+        channel = MIDI_CHANNELS[index % len(MIDI_CHANNELS)]
+        scale = TICKS_PER_BEAT / part_file.ticks_per_beat
+
+        # 파트별 velocity는 루프 밖에서 한 번만 결정
+        velocity = None
+        if highlight_part:
+            velocity = highlight_volume if part_name == highlight_part else other_volume
+
+        for track in part_file.tracks:
+            events = []
+            tick = 0
 
-    for part_name, midi_path in part_midis.items():
-        part_score = converter.parse(str(midi_path))
+            for msg in track:
+                tick += msg.time
 
-        for part in part_score.parts:
-            part.partName = part_name.capitalize()
+                if msg.type == "end_of_track":
+                    continue
+                if msg.type == "set_tempo" and index > 0:
+                    continue  # 템포는 첫 번째 파트 것만 사용
+                if msg.type == "track_name":
+                    msg = msg.copy(name=part_name.capitalize())
+                elif msg.type == "program_change":
+                    msg = msg.copy(channel=channel, program=CHOIR_PROGRAM)
+                elif msg.type == "note_on" and msg.velocity > 0 and velocity is not None:
+                    msg = msg.copy(channel=channel, velocity=velocity)
+                elif not msg.is_meta and hasattr(msg, "channel"):
+                    msg = msg.copy(channel=channel)
 
-            # 볼륨 조절 (velocity)
-            if highlight_part:
-                target_volume = highlight_volume if part_name == highlight_part else other_volume
-                for n in part.flatten().notes:
-                    if hasattr(n, 'volume') and n.volume:
-                        n.volume.velocity = target_volume
+                events.append((round(tick * scale), 0, msg))
 
-            combined_score.append(part)
+            if events:
+                combined.tracks.append(_to_track(events, []))
 
-    export_midi(combined_score, output_path, use_choir_sound=True)
+    combined.save(str(output_path))
 
     return output_path
 
@@ -1,9 +1,15 @@
 """MusicXML 파싱 모듈"""
 
+import functools
+import zipfile
+import xml.etree.ElementTree as ET
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
-from music21 import converter, stream, instrument
+import music21
+from music21 import converter, stream, instrument, freezeThaw
+
+from src.cache import cache_enabled, get_cache_dir, file_digest, write_atomic
 
 
 @dataclass
@@ -32,6 +38,9 @@ def parse_musicxml(file_path: str | Path) -> stream.Score:
     """
     MusicXML 파일을 파싱하여 music21 Score 객체로 반환
 
+    파싱 결과는 파일 내용 해시를 키로 디스크(~/.cache/pdf-score-converter/scores)와
+    메모리에 캐시되며, 호출할 때마다 새 Score 객체를 반환한다.
+
     Args:
         file_path: MusicXML 파일 경로
 
@@ -43,7 +52,52 @@ def parse_musicxml(file_path: str | Path) -> stream.Score:
     if not file_path.exists():
         raise FileNotFoundError(f"MusicXML 파일을 찾을 수 없습니다: {file_path}")
 
-    return converter.parse(str(file_path))
+    if not cache_enabled():
+        return converter.parse(str(file_path))
+
+    stat = file_path.stat()
+    frozen = _load_frozen_score(str(file_path.resolve()), stat.st_mtime_ns, stat.st_size)
+
+    # 호출자가 Score를 수정해도 캐시가 오염되지 않도록 매번 새로 복원
+    try:
+        thawer = freezeThaw.StreamThawer()
+        thawer.openStr(frozen)
+        return thawer.stream
+    except Exception as e:
+        # 손상되었거나 호환되지 않는 캐시는 지우고 원본을 다시 파싱
+        print(f"  경고: 악보 캐시를 읽을 수 없어 다시 파싱합니다 - {e}")
+        _score_cache_path(str(file_path.resolve())).unlink(missing_ok=True)
+        _load_frozen_score.cache_clear()
+        return converter.parse(str(file_path))
+
+
+def _score_cache_path(path: str) -> Path:
+    """파일 내용과 music21 버전으로 정한 악보 캐시 파일 경로"""
+    version = f"music21-{music21.VERSION_STR}".encode()
+    return get_cache_dir("scores") / f"{file_digest(path, version)}.pkl"
+
+
+@functools.lru_cache(maxsize=16)
+def _load_frozen_score(path: str, mtime_ns: int, size: int) -> bytes:
+    """
+    직렬화된 Score 반환 (디스크 캐시 확인 후 없으면 파싱하여 저장)
+
+    (path, mtime_ns, size)는 같은 프로세스 내 메모리 캐시 키로만 사용
+    """
+    cache_path = _score_cache_path(path)
+
+    if cache_path.exists():
+        return cache_path.read_bytes()
+
+    score = converter.parse(path)
+    frozen = freezeThaw.StreamFreezer(score).writeStr(fmt="pickle")
+
+    try:
+        write_atomic(cache_path, frozen)
+    except OSError as e:
+        print(f"  경고: 악보 캐시 저장 실패 - {e}")
+
+    return frozen
 
 
 def get_score_info(score: stream.Score) -> ScoreInfo:
@@ -66,33 +120,36 @@ def get_score_info(score: stream.Score) -> ScoreInfo:
     # 파트 정보 추출
     parts_info = []
     for i, part in enumerate(score.parts):
+        measures = list(part.getElementsByClass('Measure'))
+
         # 성부(voice) 수 계산
-        voices = set()
-        for measure in part.getElementsByClass('Measure'):
-            for voice in measure.voices:
-                voices.add(voice.id)
+        voices = {voice.id for measure in measures for voice in measure.voices}
         voice_count = len(voices) if voices else 1
 
         # 음자리표 추출
         clefs = part.getElementsByClass('Clef')
         clef_name = clefs[0].sign if clefs else "Unknown"
 
+        inst = part.getInstrument()
         part_info = PartInfo(
             index=i,
             name=part.partName or f"Part {i+1}",
-            instrument_name=str(part.getInstrument()) if part.getInstrument() else "Unknown",
-            measure_count=len(part.getElementsByClass('Measure')),
+            instrument_name=str(inst) if inst else "Unknown",
+            measure_count=len(measures),
             voice_count=voice_count,
             clef=clef_name
         )
         parts_info.append(part_info)
 
+    # 박자표/조표는 한 번 펼친 스트림에서 추출
+    flat = score.flatten()
+
     # 박자표 추출
-    time_sigs = score.flatten().getElementsByClass('TimeSignature')
+    time_sigs = flat.getElementsByClass('TimeSignature')
     time_sig = f"{time_sigs[0].numerator}/{time_sigs[0].denominator}" if time_sigs else "4/4"
 
     # 조표 추출
-    key_sigs = score.flatten().getElementsByClass('KeySignature')
+    key_sigs = flat.getElementsByClass('KeySignature')
     key_sig = str(key_sigs[0].sharps) + " sharps/flats" if key_sigs else "C major"
 
     # 총 마디 수
@@ -108,10 +165,149 @@ def get_score_info(score: stream.Score) -> ScoreInfo:
     )
 
 
+def _open_musicxml_stream(file_path: Path, archive: zipfile.ZipFile | None):
+    """MusicXML 본문을 읽을 바이너리 스트림 열기 (.mxl이면 압축 내부의 루트 파일)"""
+    if archive is None:
+        return open(file_path, "rb")
+
+    # META-INF/container.xml에 지정된 루트 파일 사용
+    rootfile = None
+    try:
+        container = ET.fromstring(archive.read("META-INF/container.xml"))
+        for elem in container.iter():
+            if _local_name(elem.tag) == "rootfile":
+                rootfile = elem.get("full-path")
+                break
+    except KeyError:
+        pass
+
+    if rootfile is None:
+        rootfile = next(
+            name for name in archive.namelist()
+            if not name.startswith("META-INF/") and name.endswith((".xml", ".musicxml"))
+        )
+
+    return archive.open(rootfile)
+
+
+def _local_name(tag: str) -> str:
+    """네임스페이스를 제외한 태그 이름"""
+    return tag.rsplit("}", 1)[-1]
+
+
+def get_score_info_fast(file_path: str | Path) -> ScoreInfo:
+    """
+    music21 Score를 만들지 않고 MusicXML을 스트리밍으로 읽어 악보 정보 추출
+
+    get_score_info와 같은 정보를 반환하지만 파일을 한 번만 순차적으로 읽고
+    처리한 요소는 바로 해제하므로 훨씬 빠르고 메모리를 적게 사용한다.
+
+    Args:
+        file_path: MusicXML 파일 경로 (.musicxml, .xml, .mxl)
+
+    Returns:
+        ScoreInfo 객체
+    """
+    file_path = Path(file_path)
+
+    if not file_path.exists():
+        raise FileNotFoundError(f"MusicXML 파일을 찾을 수 없습니다: {file_path}")
+
+    title = None
+    composer = None
+    time_sig = None
+    key_sig = None
+
+    # score-part id → (파트 이름, 악기 이름)
+    part_names: Dict[str, tuple] = {}
+    # part id → 파트별 집계
+    part_stats: Dict[str, Dict[str, Any]] = {}
+    current = None
+
+    archive = zipfile.ZipFile(file_path) if zipfile.is_zipfile(file_path) else None
+    try:
+        with _open_musicxml_stream(file_path, archive) as f:
+            for event, elem in ET.iterparse(f, events=("start", "end")):
+                tag = _local_name(elem.tag)
+
+                if event == "start":
+                    if tag == "part":
+                        current = part_stats.setdefault(
+                            elem.get("id"), {"measures": 0, "voices": set(), "clef": None}
+                        )
+                    continue
+
+                if tag == "score-part":
+                    name = inst_name = None
+                    for child in elem.iter():
+                        child_tag = _local_name(child.tag)
+                        if child_tag == "part-name" and name is None:
+                            name = (child.text or "").strip() or None
+                        elif child_tag == "instrument-name" and inst_name is None:
+                            inst_name = (child.text or "").strip() or None
+                    part_names[elem.get("id")] = (name, inst_name)
+                    elem.clear()
+                elif tag in ("work-title", "movement-title") and title is None:
+                    title = (elem.text or "").strip() or None
+                elif tag == "creator" and elem.get("type") == "composer" and composer is None:
+                    composer = (elem.text or "").strip() or None
+                elif current is None:
+                    continue
+                elif tag == "voice":
+                    current["voices"].add((elem.text or "").strip())
+                elif tag == "clef" and current["clef"] is None:
+                    sign = next((c.text for c in elem if _local_name(c.tag) == "sign"), None)
+                    current["clef"] = sign
+                elif tag == "time" and time_sig is None:
+                    values = {_local_name(c.tag): c.text for c in elem}
+                    if values.get("beats") and values.get("beat-type"):
+                        time_sig = f"{values['beats']}/{values['beat-type']}"
+                elif tag == "key" and key_sig is None:
+                    fifths = next((c.text for c in elem if _local_name(c.tag) == "fifths"), None)
+                    if fifths is not None:
+                        key_sig = f"{int(fifths)} sharps/flats"
+                elif tag == "measure":
+                    current["measures"] += 1
+                    # 처리한 마디는 메모리에서 해제
+                    elem.clear()
+                elif tag == "part":
+                    current = None
+                    elem.clear()
+    finally:
+        if archive is not None:
+            archive.close()
+
+    parts_info = []
+    for i, (part_id, stats) in enumerate(part_stats.items()):
+        name, inst_name = part_names.get(part_id, (None, None))
+        parts_info.append(PartInfo(
+            index=i,
+            name=name or f"Part {i+1}",
+            instrument_name=inst_name or "Unknown",
+            measure_count=stats["measures"],
+            voice_count=len(stats["voices"]) or 1,
+            clef=stats["clef"] or "Unknown"
+        ))
+
+    total_measures = max(p.measure_count for p in parts_info) if parts_info else 0
+
+    return ScoreInfo(
+        title=title,
+        composer=composer,
+        parts=parts_info,
+        total_measures=total_measures,
+        time_signature=time_sig or "4/4",
+        key_signature=key_sig or "C major"
+    )
+
+
 def print_score_info(score: stream.Score) -> None:
     """악보 정보를 출력"""
-    info = get_score_info(score)
+    print_info(get_score_info(score))
+
 
+def print_info(info: ScoreInfo) -> None:
+    """ScoreInfo를 출력"""
     print("=" * 50)
     print("악보 정보")
     print("=" * 50)
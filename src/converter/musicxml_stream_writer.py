@@ -0,0 +1,246 @@
+"""스트리밍 MusicXML 저장 모듈
+
+music21의 write('musicxml')은 악보 전체를 DOM으로 만든 뒤 한 번에 직렬화하므로
+성부 파일을 여러 개 쓸 때 시간과 메모리를 많이 쓴다. 이 모듈은 마디(Measure)로
+나뉜 파트를 한 번 훑으면서 MusicXML 요소를 파일에 바로 기록한다.
+
+성부 분리 결과 저장용이므로 음높이/길이/붙임줄/가사와 마디 속성(박자표, 조표,
+음자리표)만 기록하며, 셈여림/아티큘레이션 등 그 외 표기는 생략한다.
+"""
+
+import math
+from fractions import Fraction
+from pathlib import Path
+from typing import IO, Iterable, Optional
+from xml.sax.saxutils import escape
+
+from music21 import stream, note, clef
+
+
+XML_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<!DOCTYPE score-partwise PUBLIC "-//Recordare//DTD MusicXML 4.0 Partwise//EN" '
+    '"http://www.musicxml.org/dtds/partwise.dtd">\n'
+)
+
+# music21 음표 길이 → MusicXML <type> (그 외 길이는 <type> 생략)
+NOTE_TYPES = {
+    "maxima", "long", "breve", "whole", "half", "quarter", "eighth",
+    "16th", "32nd", "64th", "128th", "256th", "512th", "1024th",
+}
+
+# quarterLength를 분수로 바꿀 때 허용하는 최대 분모
+MAX_DENOMINATOR = 1024
+
+
+def _to_fraction(value) -> Fraction:
+    """music21 offset/quarterLength(float 또는 Fraction)를 분수로 변환"""
+    return Fraction(value).limit_denominator(MAX_DENOMINATOR)
+
+
+def _bar_length(measure: stream.Measure) -> Fraction:
+    """박자표 기준 마디 길이 (못갖춘마디 padding 제외, quarterLength)"""
+    return _to_fraction(measure.barDuration.quarterLength - measure.paddingLeft - measure.paddingRight)
+
+
+def _divisions(measures: Iterable[stream.Measure]) -> int:
+    """모든 음표 길이와 위치, 마디 길이가 정수가 되는 4분음표당 division 수 계산"""
+    divisions = 1
+    for measure in measures:
+        divisions = math.lcm(divisions, _bar_length(measure).denominator)
+        for elem in measure.notesAndRests:
+            for value in (elem.offset, elem.duration.quarterLength):
+                divisions = math.lcm(divisions, _to_fraction(value).denominator)
+    return divisions
+
+
+def _attributes_xml(
+    measure: stream.Measure,
+    divisions: Optional[int],
+    default_clef: Optional[clef.Clef]
+) -> str:
+    """마디의 <attributes> 요소 (기록할 속성이 없으면 빈 문자열)"""
+    parts = []
+    if divisions is not None:
+        parts.append(f"<divisions>{divisions}</divisions>")
+
+    for ks in measure.getElementsByClass('KeySignature'):
+        mode = getattr(ks, "mode", None)
+        mode_xml = f"<mode>{escape(mode)}</mode>" if mode else ""
+        parts.append(f"<key><fifths>{ks.sharps}</fifths>{mode_xml}</key>")
+        break
+
+    for ts in measure.getElementsByClass('TimeSignature'):
+        parts.append(f"<time><beats>{ts.numerator}</beats><beat-type>{ts.denominator}</beat-type></time>")
+        break
+
+    clefs = list(measure.getElementsByClass('Clef'))
+    clef_obj = clefs[0] if clefs else default_clef
+    if clef_obj is not None and clef_obj.sign:
+        octave = f"<clef-octave-change>{clef_obj.octaveChange}</clef-octave-change>" if clef_obj.octaveChange else ""
+        line = f"<line>{clef_obj.line}</line>" if clef_obj.line else ""
+        parts.append(f"<clef><sign>{clef_obj.sign}</sign>{line}{octave}</clef>")
+
+    if not parts:
+        return ""
+    return "<attributes>" + "".join(parts) + "</attributes>"
+
+
+def _note_xml(n: note.GeneralNote, owner: note.GeneralNote, duration: int, in_chord: bool) -> str:
+    """
+    음표/쉼표 하나의 <note> 요소
+
+    Args:
+        n: 기록할 음표/쉼표 (화음이면 구성음)
+        owner: 길이/붙임줄/가사를 가진 원본 요소 (화음이면 Chord, 아니면 n과 같음)
+        duration: division 단위 길이
+        in_chord: 화음의 두 번째 이후 구성음이면 True
+    """
+    d = owner.duration
+    out = ["<note>"]
+
+    if d.isGrace:
+        out.append("<grace/>")
+    if in_chord:
+        out.append("<chord/>")
+
+    if 'Rest' in n.classSet:
+        out.append("<rest/>")
+    else:
+        p = n.pitch
+        alter = int(p.alter) if p.alter == int(p.alter) else p.alter
+        alter_xml = f"<alter>{alter}</alter>" if alter else ""
+        out.append(f"<pitch><step>{p.step}</step>{alter_xml}<octave>{p.octave}</octave></pitch>")
+
+    if not d.isGrace:
+        out.append(f"<duration>{duration}</duration>")
+
+    tie = getattr(n, "tie", None) or getattr(owner, "tie", None)
+    tie_types = []
+    if tie is not None and tie.type in ("start", "stop", "continue"):
+        tie_types = ["stop", "start"] if tie.type == "continue" else [tie.type]
+        out.extend(f'<tie type="{t}"/>' for t in tie_types)
+
+    if d.type in NOTE_TYPES:
+        out.append(f"<type>{d.type}</type>")
+    out.extend("<dot/>" for _ in range(d.dots))
+
+    if d.tuplets:
+        tuplet = d.tuplets[0]
+        out.append(
+            f"<time-modification><actual-notes>{tuplet.numberNotesActual}</actual-notes>"
+            f"<normal-notes>{tuplet.numberNotesNormal}</normal-notes></time-modification>"
+        )
+
+    if tie_types:
+        out.append("<notations>" + "".join(f'<tied type="{t}"/>' for t in tie_types) + "</notations>")
+
+    if not in_chord:
+        for i, lyric in enumerate(owner.lyrics, start=1):
+            if not lyric.text:
+                continue
+            syllabic = f"<syllabic>{lyric.syllabic}</syllabic>" if lyric.syllabic else ""
+            out.append(
+                f'<lyric number="{lyric.number or i}">{syllabic}<text>{escape(lyric.text)}</text></lyric>'
+            )
+
+    out.append("</note>")
+    return "".join(out)
+
+
+def _write_measure(
+    f: IO[str],
+    measure: stream.Measure,
+    index: int,
+    divisions: int,
+    default_clef: Optional[clef.Clef]
+) -> None:
+    """마디 하나를 기록 (마디 안 위치가 비거나 겹치면 <forward>/<backup> 사용)"""
+    number = measure.number if measure.number is not None else index + 1
+    f.write(f'<measure number="{number}">')
+    f.write(_attributes_xml(measure, divisions if index == 0 else None, default_clef if index == 0 else None))
+
+    cursor = 0
+    for elem in measure.notesAndRests:
+        offset = int(_to_fraction(elem.offset) * divisions)
+        duration = 0 if elem.duration.isGrace else int(_to_fraction(elem.duration.quarterLength) * divisions)
+
+        if offset > cursor:
+            f.write(f"<forward><duration>{offset - cursor}</duration></forward>")
+        elif offset < cursor:
+            f.write(f"<backup><duration>{cursor - offset}</duration></backup>")
+
+        classes = elem.classSet
+        if 'Chord' in classes:
+            # 화음 구성음의 길이/가사는 화음 기준으로 기록
+            for i, n in enumerate(elem.notes):
+                f.write(_note_xml(n, elem, duration, in_chord=i > 0))
+        elif 'Note' in classes or 'Rest' in classes:
+            f.write(_note_xml(elem, elem, duration, in_chord=False))
+        else:
+            # 무음정 타악기 등은 길이만큼 건너뜀
+            f.write(f"<forward><duration>{duration}</duration></forward>")
+
+        cursor = offset + duration
+
+    # 마디 끝이 비어 있으면 박자표 길이까지 쉼표로 채움
+    # (짧은 마디는 못갖춘마디로 읽혀 이후 마디가 밀림, <forward>는 마디 길이에 반영되지 않음)
+    bar_end = int(_bar_length(measure) * divisions)
+    if cursor < bar_end:
+        f.write(f"<note><rest/><duration>{bar_end - cursor}</duration></note>")
+
+    f.write("</measure>\n")
+
+
+def write_part_musicxml(
+    part: stream.Part,
+    output_path: str | Path,
+    title: Optional[str] = None
+) -> Path:
+    """
+    마디로 나뉜 파트 하나를 MusicXML 파일로 바로 기록
+
+    Args:
+        part: 저장할 파트 (Measure를 포함해야 함)
+        output_path: 출력 파일 경로
+        title: 악보 제목 (선택)
+
+    Returns:
+        저장된 파일 경로
+    """
+    measures = list(part.getElementsByClass('Measure'))
+    if not measures:
+        raise ValueError("마디가 없는 파트는 스트리밍 저장을 지원하지 않음")
+
+    divisions = _divisions(measures)
+
+    # 첫 마디에 음자리표가 없으면 음역에 맞는 음자리표 지정 (music21 write와 동일)
+    default_clef = None
+    if not measures[0].getElementsByClass('Clef'):
+        default_clef = clef.bestClef(part, recurse=True)
+
+    instruments = list(part.getElementsByClass('Instrument'))
+    midi_program = instruments[0].midiProgram if instruments else None
+    part_name = part.partName or ""
+
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(XML_HEADER)
+        f.write('<score-partwise version="4.0">\n')
+        if title:
+            f.write(f"<work><work-title>{escape(title)}</work-title></work>\n")
+
+        f.write('<part-list><score-part id="P1">')
+        f.write(f"<part-name>{escape(part_name)}</part-name>")
+        if midi_program is not None:
+            f.write('<score-instrument id="P1-I1">')
+            f.write(f"<instrument-name>{escape(part_name or 'Voice')}</instrument-name></score-instrument>")
+            # MusicXML의 midi-program은 1부터 시작
+            f.write(f'<midi-instrument id="P1-I1"><midi-program>{midi_program + 1}</midi-program></midi-instrument>')
+        f.write("</score-part></part-list>\n")
+
+        f.write('<part id="P1">\n')
+        for index, measure in enumerate(measures):
+            _write_measure(f, measure, index, divisions, default_clef)
+        f.write("</part>\n</score-partwise>\n")
+
+    return Path(output_path)
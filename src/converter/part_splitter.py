@@ -1,9 +1,18 @@
 """성부 분리 모듈"""
 
+import itertools
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
 from enum import Enum
-from music21 import stream, note, chord, clef, instrument, meter, key
+
+import numpy as np
+from music21 import stream, note, chord, clef, instrument, meter
+
+from .musicxml_stream_writer import write_part_musicxml
 
 
 class VoiceType(Enum):
@@ -28,6 +37,105 @@ VOICE_INSTRUMENTS = {
     VoiceType.OTHER: 52,
 }
 
+# 파트 이름으로 성부 추정 (약어는 단어 시작에서만 인정: "written"의 "ten" 등 제외)
+VOICE_NAME_PATTERN = re.compile(
+    r"(?P<soprano>soprano|\bsop)"
+    r"|(?P<alto>alto)"
+    r"|(?P<tenor>tenor|\bten)"
+    r"|(?P<bass>bass|\bbas)"
+    r"|(?P<piano>piano)"
+    r"|(?P<violin>violin|\bvln)"
+)
+VOICE_NAME_PRIORITY = (
+    VoiceType.SOPRANO, VoiceType.ALTO, VoiceType.TENOR,
+    VoiceType.BASS, VoiceType.PIANO, VoiceType.VIOLIN,
+)
+
+# SATB 성부 순서와 파일명 (높은 음역 먼저)
+SATB_VTYPES = (VoiceType.SOPRANO, VoiceType.ALTO, VoiceType.TENOR, VoiceType.BASS)
+SATB_NAMES = tuple(vtype.value for vtype in SATB_VTYPES)
+
+
+def _empty_pitches() -> np.ndarray:
+    return np.empty(0, dtype=np.int16)
+
+
+@dataclass
+class PartStats:
+    """파트의 음표 통계 (성부 자동 분류용)"""
+    note_count: int = 0
+    chord_count: int = 0
+    pitches: np.ndarray = field(default_factory=_empty_pitches)      # 단일 음표의 MIDI 음높이
+    all_pitches: np.ndarray = field(default_factory=_empty_pitches)  # 화음 구성음 포함
+
+    @property
+    def chord_ratio(self) -> float:
+        return self.chord_count / self.note_count if self.note_count else 0
+
+    @property
+    def mean_pitch(self) -> float:
+        return float(self.pitches.mean()) if self.pitches.size else 0
+
+    @property
+    def median_pitch(self) -> int:
+        """정렬했을 때 가운데(짝수 개면 위쪽) 음높이 (전체 정렬 대신 partition 사용)"""
+        if not self.all_pitches.size:
+            return 60
+        k = self.all_pitches.size // 2
+        return int(np.partition(self.all_pitches, k)[k])
+
+
+def get_part_stats(part: stream.Part) -> PartStats:
+    """
+    파트를 한 번만 flatten하여 음표 수, 화음 수, 음높이 배열 계산
+
+    Args:
+        part: music21 Part 객체
+
+    Returns:
+        PartStats
+    """
+    pitches = []
+    all_pitches = []
+    note_count = 0
+    chord_count = 0
+
+    # 음표 목록을 따로 만들지 않고 한 번 순회하며 개수와 음높이를 함께 집계
+    for n in part.flatten().notes:
+        note_count += 1
+        if 'Chord' in n.classSet:
+            chord_count += 1
+            all_pitches.extend(p.midi for p in n.pitches)
+        elif hasattr(n, 'pitch'):
+            pitches.append(n.pitch.midi)
+            all_pitches.append(n.pitch.midi)
+
+    return PartStats(
+        note_count=note_count,
+        chord_count=chord_count,
+        pitches=np.array(pitches, dtype=np.int16),
+        all_pitches=np.array(all_pitches, dtype=np.int16),
+    )
+
+
+def _bulk_insert(target: stream.Stream, pairs: List[Tuple[float, object]]) -> None:
+    """
+    (오프셋, 요소) 목록을 한 번에 삽입
+
+    insert()는 요소마다 정렬 상태와 캐시를 갱신하므로, coreInsert로 모두 넣은 뒤
+    coreElementsChanged()를 한 번만 호출한다.
+    """
+    for offset, elem in pairs:
+        target.coreInsert(offset, elem)
+    target.coreElementsChanged()
+
+
+def _bulk_append(target: stream.Stream, elements: List[object]) -> None:
+    """요소들을 차례로 이어 붙인 뒤 coreElementsChanged()를 한 번만 호출"""
+    for elem in elements:
+        target.coreAppend(elem)
+    target.coreElementsChanged()
+
 
 def detect_voice_type(part: stream.Part, part_index: int, total_parts: int) -> VoiceType:
     """
@@ -43,19 +151,11 @@ def detect_voice_type(part: stream.Part, part_index: int, total_parts: int) -> V
     """
     part_name = (part.partName or "").lower()
 
-    # 이름으로 추정
-    if "soprano" in part_name or "sop" in part_name:
-        return VoiceType.SOPRANO
-    elif "alto" in part_name:
-        return VoiceType.ALTO
-    elif "tenor" in part_name or "ten" in part_name:
-        return VoiceType.TENOR
-    elif "bass" in part_name or "bas" in part_name:
-        return VoiceType.BASS
-    elif "piano" in part_name:
-        return VoiceType.PIANO
-    elif "violin" in part_name or "vln" in part_name:
-        return VoiceType.VIOLIN
+    # 이름으로 추정 (여러 성부 이름이 있으면 VOICE_NAME_PATTERN의 앞쪽 그룹 우선)
+    groups = {m.lastgroup for m in VOICE_NAME_PATTERN.finditer(part_name)}
+    for vtype in VOICE_NAME_PRIORITY:
+        if vtype.value in groups:
+            return vtype
 
     # 음자리표로 추정
     clefs = part.getElementsByClass('Clef')
@@ -96,34 +196,36 @@ def extract_voice(
 
     # 악기 설정
     inst = instrument.Instrument()
-    inst.midiProgram = VOICE_INSTRUMENTS.get(voice_type, 52)
+    inst.midiProgram = VOICE_INSTRUMENTS[voice_type]  # 모든 VoiceType이 등록되어 있음
     new_part.insert(0, inst)
 
+    voice_key = str(voice_id)
+    measures = []
+
     for measure in part.getElementsByClass('Measure'):
         new_measure = stream.Measure(number=measure.number)
 
-        # 박자표, 조표 복사
-        for ts in measure.getElementsByClass('TimeSignature'):
-            new_measure.insert(ts.offset, ts)
-        for ks in measure.getElementsByClass('KeySignature'):
-            new_measure.insert(ks.offset, ks)
-        for c in measure.getElementsByClass('Clef'):
-            new_measure.insert(c.offset, c)
+        # 박자표, 조표, 음자리표 복사
+        pairs = [
+            (elem.offset, elem)
+            for elem in measure.getElementsByClass(['TimeSignature', 'KeySignature', 'Clef'])
+        ]
 
         # 음표/쉼표 추출
         if voice_id is not None and measure.hasVoices():
-            # 특정 voice만 추출
-            for voice in measure.voices:
-                if voice.id == voice_id or str(voice.id) == str(voice_id):
-                    for elem in voice.notesAndRests:
-                        new_measure.insert(elem.offset, elem)
+            # 특정 voice만 추출 (voice ID는 숫자/문자열 모두 허용)
+            voice_map = {str(v.id): v for v in measure.voices}
+            voice = voice_map.get(voice_key)
+            if voice is not None:
+                pairs.extend((elem.offset, elem) for elem in voice.notesAndRests)
         else:
             # 모든 음표 복사
-            for elem in measure.notesAndRests:
-                new_measure.insert(elem.offset, elem)
+            pairs.extend((elem.offset, elem) for elem in measure.notesAndRests)
 
-        new_part.append(new_measure)
+        _bulk_insert(new_measure, pairs)
+        measures.append(new_measure)
 
+    _bulk_append(new_part, measures)
     return new_part
 
 
@@ -146,57 +248,122 @@ def split_grand_staff(part: stream.Part) -> Tuple[stream.Part, stream.Part]:
     upper_part.partName = "Upper"
     lower_part.partName = "Lower"
 
+    split = 60  # Middle C 이상은 상단
+    upper_measures = []
+    lower_measures = []
+
     for measure in part.getElementsByClass('Measure'):
         upper_measure = stream.Measure(number=measure.number)
         lower_measure = stream.Measure(number=measure.number)
+        upper_pairs = []
+        lower_pairs = []
+        upper_add = upper_pairs.append
+        lower_add = lower_pairs.append
 
-        # 메타데이터 복사
-        for ts in measure.getElementsByClass('TimeSignature'):
-            upper_measure.insert(ts.offset, ts)
-            lower_measure.insert(ts.offset, ts)
+        # 마디 요소를 한 번만 순회하며 클래스 이름으로 분기
+        for elem in measure:
+            kind = elem.classes[0]
 
-        for elem in measure.notesAndRests:
-            if isinstance(elem, chord.Chord):
+            if kind == 'Chord':
                 # 화음: 음역대로 분리
-                upper_notes = []
-                lower_notes = []
-
-                for n in elem.notes:
-                    if n.pitch.midi >= 60:  # Middle C 이상
-                        upper_notes.append(n)
-                    else:
-                        lower_notes.append(n)
+                notes = elem.notes
+                upper_notes = [n for n in notes if n.pitch.midi >= split]
+                lower_notes = [n for n in notes if n.pitch.midi < split]
 
                 if upper_notes:
-                    if len(upper_notes) == 1:
-                        upper_measure.insert(elem.offset, upper_notes[0])
-                    else:
-                        upper_measure.insert(elem.offset, chord.Chord(upper_notes))
-
+                    upper_add((elem.offset, upper_notes[0] if len(upper_notes) == 1 else chord.Chord(upper_notes)))
                 if lower_notes:
-                    if len(lower_notes) == 1:
-                        lower_measure.insert(elem.offset, lower_notes[0])
-                    else:
-                        lower_measure.insert(elem.offset, chord.Chord(lower_notes))
+                    lower_add((elem.offset, lower_notes[0] if len(lower_notes) == 1 else chord.Chord(lower_notes)))
 
-            elif isinstance(elem, note.Note):
+            elif kind == 'Note':
                 # 단일 음표: 음역대로 분류
-                if elem.pitch.midi >= 60:
-                    upper_measure.insert(elem.offset, elem)
+                if elem.pitch.midi >= split:
+                    upper_add((elem.offset, elem))
                 else:
-                    lower_measure.insert(elem.offset, elem)
-
-            elif isinstance(elem, note.Rest):
-                # 쉼표: 양쪽에 복사
-                upper_measure.insert(elem.offset, elem)
-                lower_measure.insert(elem.offset, elem)
+                    lower_add((elem.offset, elem))
+
+            elif kind == 'Rest' or kind == 'TimeSignature':
+                # 쉼표와 박자표는 양쪽에 (두 파트를 병렬 저장할 때 activeSite가 섞이지 않도록
+                # 하단에는 새 객체 사용 - deepcopy보다 훨씬 가벼움)
+                upper_add((elem.offset, elem))
+                if kind == 'Rest':
+                    lower_add((elem.offset, note.Rest(quarterLength=elem.quarterLength)))
+                else:
+                    lower_add((elem.offset, meter.TimeSignature(elem.ratioString)))
 
-        upper_part.append(upper_measure)
-        lower_part.append(lower_measure)
+        _bulk_insert(upper_measure, upper_pairs)
+        _bulk_insert(lower_measure, lower_pairs)
+        upper_measures.append(upper_measure)
+        lower_measures.append(lower_measure)
 
+    _bulk_append(upper_part, upper_measures)
+    _bulk_append(lower_part, lower_measures)
     return upper_part, lower_part
 
 
+def save_part(part: stream.Part, output_path: str | Path, metadata=None) -> Path:
+    """
+    파트 하나를 MusicXML 파일로 저장
+
+    마디로 나뉜 단일 voice 파트는 스트리밍 저장기로 바로 기록하고(Score 생성 없음),
+    그 외(마디가 없거나 마디 안에 여러 voice가 있는 파트)만 Score로 감싸 music21로 저장.
+    save_parts가 파트들을 동시에 저장하므로 Score 하나를 템플릿으로 돌려쓰지 않는다.
+
+    Args:
+        part: 저장할 파트
+        output_path: 출력 파일 경로
+        metadata: 악보 메타데이터 (선택)
+
+    Returns:
+        저장된 파일 경로
+    """
+    measures = list(part.getElementsByClass('Measure'))
+    if measures and not any(m.hasVoices() for m in measures):
+        title = metadata.title if metadata is not None else None
+        return write_part_musicxml(part, output_path, title=title)
+
+    new_score = stream.Score()
+    if metadata is not None:
+        new_score.metadata = metadata
+    new_score.append(part)
+    new_score.write('musicxml', fp=os.fspath(output_path))
+    return Path(output_path)
+
+
+def save_parts(jobs: List[Tuple[object, stream.Part, str]], metadata=None) -> Dict[object, Path]:
+    """
+    여러 파트를 병렬로 저장
+
+    파트별 저장은 서로 독립적이므로 스레드 풀에서 동시에 진행하여
+    직렬화와 파일 쓰기를 겹친다. 같은 경로가 여러 번 나오면 마지막 파트만 저장.
+
+    Args:
+        jobs: (결과 키, 파트, 출력 경로) 목록
+        metadata: 악보 메타데이터 (선택)
+
+    Returns:
+        결과 키 → 파일 경로 딕셔너리 (jobs 순서)
+    """
+    # 같은 파일에 동시에 쓰지 않도록 경로별 마지막 작업만 남김
+    unique_jobs = list({path: (key, part, path) for key, part, path in jobs}.values())
+
+    if len(unique_jobs) > 1:
+        max_workers = min(len(unique_jobs), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(save_part, part, path, metadata) for _, part, path in unique_jobs]
+            for future in futures:
+                future.result()
+    else:
+        for _, part, path in unique_jobs:
+            save_part(part, path, metadata)
+
+    results = {}
+    for key, _, path in jobs:
+        results[key] = Path(path)
+        print(f"  저장됨: {os.path.basename(path)}")
+    return results
+
+
 def split_parts(
     score: stream.Score,
     output_dir: str | Path,
@@ -215,8 +382,9 @@ def split_parts(
     """
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
+    out_str = os.fspath(output_dir)  # 파트별 경로는 문자열로 조합
 
-    results = {}
+    jobs = []
     total_parts = len(score.parts)
 
     for i, part in enumerate(score.parts):
@@ -226,25 +394,11 @@ def split_parts(
         else:
             vtype = detect_voice_type(part, i, total_parts)
 
-        # 새 악보 생성
-        new_score = stream.Score()
-
-        # 메타데이터 복사
-        if score.metadata:
-            new_score.metadata = score.metadata
-
-        # 파트 추출 및 추가
+        # 파트 추출 (저장은 모아서 병렬로)
         extracted_part = extract_voice(part, voice_type=vtype)
-        new_score.append(extracted_part)
-
-        # 파일 저장
-        output_path = output_dir / f"{vtype.value}.musicxml"
-        new_score.write('musicxml', fp=str(output_path))
-        results[vtype] = output_path
+        jobs.append((vtype, extracted_part, os.path.join(out_str, f"{vtype.value}.musicxml")))
 
-        print(f"  저장됨: {output_path.name}")
-
-    return results
+    return save_parts(jobs, score.metadata)
 
 
 def split_combined_voices(
@@ -267,63 +421,65 @@ def split_combined_voices(
     # flatten()으로 모든 음표를 단순 리스트로 추출
     all_notes = list(part.flatten().notesAndRests)
 
+    kinds = [elem.classes[0] for elem in all_notes]
+
+    # 음표/화음 구성음의 MIDI 음높이를 한 배열로 모아 기준음과 한 번에 비교한 뒤
+    # 요소별 마스크로 다시 나눔 (쉼표는 길이 0)
+    pitch_lists = [
+        [n.pitch.midi for n in elem.notes] if kind == 'Chord'
+        else [elem.pitch.midi] if kind == 'Note'
+        else []
+        for elem, kind in zip(all_notes, kinds)
+    ]
+    counts = np.fromiter(map(len, pitch_lists), dtype=np.intp, count=len(pitch_lists))
+    midis = np.fromiter(
+        itertools.chain.from_iterable(pitch_lists), dtype=np.int16, count=int(counts.sum())
+    )
+    upper_masks = np.split(midis >= split_pitch, np.cumsum(counts)[:-1])
+
+    # (오프셋, 요소) 목록: 원본 요소는 수정하지 않고 그대로 재사용하며
+    # 화음이 실제로 양쪽으로 나뉠 때만 새 객체를 만듦
     upper_notes = []
     lower_notes = []
 
-    for elem in all_notes:
-        if isinstance(elem, chord.Chord):
+    def partition(elem, offset, members, target):
+        if len(members) == len(elem.notes):
+            target.append((offset, elem))
+        elif len(members) == 1:
+            target.append((offset, members[0]))
+        else:
+            new_chord = chord.Chord([n.pitch for n in members])
+            new_chord.duration = elem.duration
+            target.append((offset, new_chord))
+
+    for elem, kind, upper_mask in zip(all_notes, kinds, upper_masks):
+        offset = elem.offset
+
+        if kind == 'Chord':
             # 화음: 상단/하단 분리
-            high_notes = [n for n in elem.notes if n.pitch.midi >= split_pitch]
-            low_notes = [n for n in elem.notes if n.pitch.midi < split_pitch]
+            notes = elem.notes
+            high_notes = [notes[i] for i in np.flatnonzero(upper_mask)]
+            low_notes = [notes[i] for i in np.flatnonzero(~upper_mask)]
 
             if high_notes:
-                if len(high_notes) == 1:
-                    new_note = note.Note(high_notes[0].pitch)
-                    new_note.duration = elem.duration
-                    new_note.offset = elem.offset
-                    upper_notes.append(new_note)
-                else:
-                    new_chord = chord.Chord([n.pitch for n in high_notes])
-                    new_chord.duration = elem.duration
-                    new_chord.offset = elem.offset
-                    upper_notes.append(new_chord)
-
+                partition(elem, offset, high_notes, upper_notes)
             if low_notes:
-                if len(low_notes) == 1:
-                    new_note = note.Note(low_notes[0].pitch)
-                    new_note.duration = elem.duration
-                    new_note.offset = elem.offset
-                    lower_notes.append(new_note)
-                else:
-                    new_chord = chord.Chord([n.pitch for n in low_notes])
-                    new_chord.duration = elem.duration
-                    new_chord.offset = elem.offset
-                    lower_notes.append(new_chord)
-
-        elif isinstance(elem, note.Note):
-            new_note = note.Note(elem.pitch)
-            new_note.duration = elem.duration
-            new_note.offset = elem.offset
-            if elem.pitch.midi >= split_pitch:
-                upper_notes.append(new_note)
+                partition(elem, offset, low_notes, lower_notes)
+
+        elif kind == 'Note':
+            if upper_mask[0]:
+                upper_notes.append((offset, elem))
             else:
-                lower_notes.append(new_note)
+                lower_notes.append((offset, elem))
 
-        elif isinstance(elem, note.Rest):
-            # 쉼표는 양쪽에
-            r1 = note.Rest(duration=elem.duration)
-            r1.offset = elem.offset
-            r2 = note.Rest(duration=elem.duration)
-            r2.offset = elem.offset
-            upper_notes.append(r1)
-            lower_notes.append(r2)
+        elif kind == 'Rest':
+            # 쉼표는 양쪽에 (병렬 저장 시 activeSite가 섞이지 않도록 하단은 새 쉼표 사용)
+            upper_notes.append((offset, elem))
+            lower_notes.append((offset, note.Rest(quarterLength=elem.quarterLength)))
 
     # 파트에 음표 추가
-    for n in upper_notes:
-        upper_part.insert(n.offset, n)
-
-    for n in lower_notes:
-        lower_part.insert(n.offset, n)
+    _bulk_insert(upper_part, upper_notes)
+    _bulk_insert(lower_part, lower_notes)
 
     return upper_part, lower_part
 
@@ -346,51 +502,40 @@ def split_satb(
     """
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
+    out_str = os.fspath(output_dir)  # 파트별 경로는 문자열로 조합
 
-    results = {}
+    jobs = []  # (성부명, 파트, 출력 경로) - 분리가 끝난 뒤 한꺼번에 병렬 저장
+    piano_parts = []
     parts = list(score.parts)
 
     # 파트 수에 따른 처리
     if len(parts) == 4:
         # 이상적인 경우: 4개 파트 = SATB
-        voice_names = ["soprano", "alto", "tenor", "bass"]
-        for i, (part, name) in enumerate(zip(parts, voice_names)):
-            new_score = stream.Score()
-            extracted = extract_voice(part, voice_type=VoiceType(name))
-            new_score.append(extracted)
-
-            output_path = output_dir / f"{name}.musicxml"
-            new_score.write('musicxml', fp=str(output_path))
-            results[name] = output_path
-            print(f"  저장됨: {output_path.name}")
+        for part, vtype in zip(parts, SATB_VTYPES):
+            extracted = extract_voice(part, voice_type=vtype)
+            jobs.append((vtype.value, extracted, os.path.join(out_str, f"{vtype.value}.musicxml")))
 
     elif len(parts) == 2:
         # 2개 파트: 대보표 2개 (SA + TB)
         upper1, lower1 = split_grand_staff(parts[0])
         upper2, lower2 = split_grand_staff(parts[1])
 
-        for part, name in [(upper1, "soprano"), (lower1, "alto"),
-                           (upper2, "tenor"), (lower2, "bass")]:
-            new_score = stream.Score()
+        for part, name in zip((upper1, lower1, upper2, lower2), SATB_NAMES):
             part.partName = name.capitalize()
-            new_score.append(part)
-
-            output_path = output_dir / f"{name}.musicxml"
-            new_score.write('musicxml', fp=str(output_path))
-            results[name] = output_path
-            print(f"  저장됨: {output_path.name}")
+            jobs.append((name, part, os.path.join(out_str, f"{name}.musicxml")))
 
     else:
         # Audiveris 등 복잡한 출력: 성부 자동 분류
         # Voice 파트와 Piano 파트 분리
         voice_parts = []
-        piano_parts = []
+
+        # 파트별 통계는 한 번만 계산하여 아래 분류/분리에서 재사용
+        stats = {id(p): get_part_stats(p) for p in parts}
 
         for part in parts:
             inst = part.getInstrument()
-            notes = list(part.flatten().notes)
 
-            if len(notes) < 50:
+            if stats[id(part)].note_count < 50:
                 continue  # 음표가 적은 파트 무시 (인트로/아웃트로 등)
 
             if 'Piano' in str(inst) or 'piano' in (part.partName or '').lower():
@@ -398,135 +543,74 @@ def split_satb(
             else:
                 voice_parts.append(part)
 
-        # 화음 비율로 합쳐진 파트 판별
-        def get_chord_ratio(part):
-            notes = list(part.flatten().notes)
-            if not notes:
-                return 0
-            chords = [n for n in notes if isinstance(n, chord.Chord)]
-            return len(chords) / len(notes)
-
         # 화음 비율이 높은 파트(>30%)는 합쳐진 성부로 간주
-        combined_parts = [p for p in voice_parts if get_chord_ratio(p) > 0.3]
-        melody_parts = [p for p in voice_parts if get_chord_ratio(p) <= 0.3]
+        combined_parts = [p for p in voice_parts if stats[id(p)].chord_ratio > 0.3]
+        melody_parts = [p for p in voice_parts if stats[id(p)].chord_ratio <= 0.3]
 
         print(f"  감지: 합쳐진 파트 {len(combined_parts)}개, 단선율 {len(melody_parts)}개")
 
         # 합쳐진 파트가 2개인 경우: SA + TB로 분리
         if len(combined_parts) == 2:
-            # 음역대 분석으로 SA/TB 판별
-            ranges = []
-            for vp in combined_parts:
-                pitches = [n.pitch.midi for n in vp.flatten().notes if hasattr(n, 'pitch')]
-                if pitches:
-                    ranges.append((min(pitches), max(pitches), sum(pitches)/len(pitches)))
-                else:
-                    ranges.append((0, 0, 0))
-
-            # 평균 음높이가 높은 것이 SA
-            if ranges[0][2] > ranges[1][2]:
+            # 음역대 분석으로 SA/TB 판별: 평균 음높이가 높은 것이 SA
+            if stats[id(combined_parts[0])].mean_pitch > stats[id(combined_parts[1])].mean_pitch:
                 sa_part, tb_part = combined_parts[0], combined_parts[1]
             else:
                 sa_part, tb_part = combined_parts[1], combined_parts[0]
 
-            # 각 파트의 중간값을 기준으로 분리
-            def get_median_pitch(part):
-                pitches = []
-                for n in part.flatten().notes:
-                    if isinstance(n, chord.Chord):
-                        for p in n.pitches:
-                            pitches.append(p.midi)
-                    elif hasattr(n, 'pitch'):
-                        pitches.append(n.pitch.midi)
-                if pitches:
-                    pitches.sort()
-                    return pitches[len(pitches) // 2]
-                return 60
-
             # SA 분리 (중간값 기준)
-            sa_median = get_median_pitch(sa_part)
+            sa_median = stats[id(sa_part)].median_pitch
             print(f"  SA 분리 기준: MIDI {sa_median}")
             soprano, alto = split_combined_voices(sa_part, split_pitch=sa_median)
             soprano.partName = "Soprano"
             alto.partName = "Alto"
 
             # TB 분리 (중간값 기준)
-            tb_median = get_median_pitch(tb_part)
+            tb_median = stats[id(tb_part)].median_pitch
             print(f"  TB 분리 기준: MIDI {tb_median}")
             tenor, bass = split_combined_voices(tb_part, split_pitch=tb_median)
             tenor.partName = "Tenor"
             bass.partName = "Bass"
 
             # SATB 저장
-            for part, name in [(soprano, "soprano"), (alto, "alto"),
-                               (tenor, "tenor"), (bass, "bass")]:
+            for part, name in zip((soprano, alto, tenor, bass), SATB_NAMES):
                 # 악기 설정
                 inst = instrument.Instrument()
                 inst.midiProgram = 52  # Choir Aahs
                 part.insert(0, inst)
-
-                new_score = stream.Score()
-                new_score.append(part)
-
-                output_path = output_dir / f"{name}.musicxml"
-                new_score.write('musicxml', fp=str(output_path))
-                results[name] = output_path
-                print(f"  저장됨: {output_path.name}")
+                jobs.append((name, part, os.path.join(out_str, f"{name}.musicxml")))
 
         elif len(voice_parts) >= 3:
             # 3개 이상: 음역대로 SATB 추정
             # 음역별 정렬
-            parts_with_range = []
-            for vp in voice_parts:
-                pitches = [n.pitch.midi for n in vp.flatten().notes if hasattr(n, 'pitch')]
-                if pitches:
-                    avg_pitch = sum(pitches) / len(pitches)
-                    parts_with_range.append((avg_pitch, vp))
+            parts_with_range = [
+                (stats[id(vp)].mean_pitch, vp) for vp in voice_parts if stats[id(vp)].pitches.size
+            ]
 
             parts_with_range.sort(key=lambda x: x[0], reverse=True)  # 높은 음역 먼저
 
-            voice_names = ["soprano", "alto", "tenor", "bass"]
-            for i, (_, part) in enumerate(parts_with_range[:4]):
-                name = voice_names[i] if i < 4 else f"voice_{i+1}"
-
+            for (_, part), name in zip(parts_with_range, SATB_NAMES):
                 inst = instrument.Instrument()
                 inst.midiProgram = 52
                 part.insert(0, inst)
                 part.partName = name.capitalize()
-
-                new_score = stream.Score()
-                new_score.append(part)
-
-                output_path = output_dir / f"{name}.musicxml"
-                new_score.write('musicxml', fp=str(output_path))
-                results[name] = output_path
-                print(f"  저장됨: {output_path.name}")
+                jobs.append((name, part, os.path.join(out_str, f"{name}.musicxml")))
 
         else:
             # 그 외: 그대로 저장
             for i, part in enumerate(voice_parts):
-                new_score = stream.Score()
-                new_score.append(part)
-
-                output_path = output_dir / f"voice_{i+1}.musicxml"
-                new_score.write('musicxml', fp=str(output_path))
-                results[f"voice_{i+1}"] = output_path
-                print(f"  저장됨: {output_path.name}")
-
-        # 피아노 파트 저장 (옵션)
-        if piano_parts:
-            for i, part in enumerate(piano_parts):
-                try:
-                    new_score = stream.Score()
-                    new_score.append(part)
-
-                    name = "piano" if len(piano_parts) == 1 else f"piano_{i+1}"
-                    output_path = output_dir / f"{name}.musicxml"
-                    new_score.write('musicxml', fp=str(output_path))
-                    results[name] = output_path
-                    print(f"  저장됨: {output_path.name}")
-                except Exception as e:
-                    print(f"  경고: 피아노 파트 저장 실패 - {e}")
+                jobs.append((f"voice_{i+1}", part, os.path.join(out_str, f"voice_{i+1}.musicxml")))
+
+    results = save_parts(jobs)
+
+    # 피아노 파트 저장 (옵션)
+    for i, part in enumerate(piano_parts):
+        try:
+            name = "piano" if len(piano_parts) == 1 else f"piano_{i+1}"
+            output_path = os.path.join(out_str, f"{name}.musicxml")
+            results[name] = save_part(part, output_path)
+            print(f"  저장됨: {os.path.basename(output_path)}")
+        except Exception as e:
+            print(f"  경고: 피아노 파트 저장 실패 - {e}")
 
     return results
 
@@ -5,13 +5,28 @@
 - oemer: Python 딥러닝 기반, 느리지만 설치 간편
 """
 
+import importlib
+import importlib.util
+
 # Audiveris를 기본으로 사용 (더 빠름)
-try:
-    from .audiveris_wrapper import recognize_score, recognize_pdf
+# find_spec은 모듈을 실행하지 않으므로 엔진 래퍼는 실제로 쓸 때 import
+if importlib.util.find_spec(".audiveris_wrapper", __name__) is not None:
     OMR_ENGINE = "audiveris"
-except ImportError:
-    from .oemer_wrapper import recognize_score
-    from .oemer_wrapper import recognize_images
+    _ENGINE_MODULE = ".audiveris_wrapper"
+    _ENGINE_EXPORTS = ("recognize_score", "recognize_pdf")
+else:
     OMR_ENGINE = "oemer"
+    _ENGINE_MODULE = ".oemer_wrapper"
+    _ENGINE_EXPORTS = ("recognize_score", "recognize_images")
+
+
+def __getattr__(name: str):
+    """엔진 함수에 처음 접근할 때 래퍼 모듈을 import (PEP 562)"""
+    if name in _ENGINE_EXPORTS:
+        value = getattr(importlib.import_module(_ENGINE_MODULE, __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = ["recognize_score", "OMR_ENGINE"]
@@ -1,9 +1,21 @@
 """Audiveris OMR 엔진 래퍼 모듈"""
 
+import collections
+import os
+import shutil
 import subprocess
+import threading
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
+from src.cache import is_up_to_date, load_tool_path, save_tool_path
+
+
+# Audiveris 출력 MusicXML 확장자
+MUSICXML_SUFFIXES = (".mxl", ".musicxml")
+
+# 오류 메시지에 포함할 Audiveris 로그 줄 수
+LOG_TAIL_LINES = 50
 
 # Audiveris 실행 파일 경로
 AUDIVERIS_PATHS = [
@@ -12,53 +24,167 @@ AUDIVERIS_PATHS = [
     "audiveris",
 ]
 
+# find_audiveris 결과 (strict 여부 → 경로)와 첫 탐색이 중복 실행되지 않도록 하는 잠금
+_found_paths: Dict[bool, Optional[str]] = {}
+_find_lock = threading.Lock()
 
-def find_audiveris() -> Optional[str]:
+
+def find_audiveris(strict: bool = False) -> Optional[str]:
     """
     시스템에서 Audiveris 실행 파일 찾기
 
+    PATH 검색(shutil.which)과 파일 존재 여부로만 찾고, 결과는 프로세스 안에서
+    재사용하며 캐시(tools.json)에도 저장한다. 여러 스레드가 동시에 호출해도
+    탐색은 한 번만 실행된다.
+
+    Args:
+        strict: True면 저장된 경로를 쓰지 않고 -help로 실제 실행되는지 확인
+
     Returns:
         Audiveris 실행 경로 (없으면 None)
     """
+    # 이미 찾았으면 잠금 없이 반환
+    try:
+        return _found_paths[strict]
+    except KeyError:
+        pass
+
+    with _find_lock:
+        if strict not in _found_paths:
+            _found_paths[strict] = _discover_audiveris(strict)
+        return _found_paths[strict]
+
+
+def prefetch() -> None:
+    """Audiveris 경로를 미리 찾아 둠 (명령 시작 시 호출)"""
+    find_audiveris()
+
+
+def _discover_audiveris(strict: bool) -> Optional[str]:
+    """find_audiveris의 실제 탐색"""
+    if not strict:
+        cached = load_tool_path("audiveris")
+        if cached is not None:
+            return cached
+
     for path in AUDIVERIS_PATHS:
-        try:
-            result = subprocess.run(
-                [path, "-help"],
-                capture_output=True,
-                timeout=10
-            )
-            if result.returncode == 0:
-                return path
-        except (FileNotFoundError, subprocess.TimeoutExpired):
+        resolved = shutil.which(path) or (path if os.path.exists(path) else None)
+        if resolved is None:
             continue
+
+        if strict:
+            try:
+                result = subprocess.run(
+                    [resolved, "-help"],
+                    capture_output=True,
+                    timeout=10
+                )
+            except (OSError, subprocess.TimeoutExpired):
+                continue
+            if result.returncode != 0:
+                continue
+
+        save_tool_path("audiveris", resolved)
+        return resolved
     return None
 
 
-def recognize_pdf(
-    pdf_path: str | Path,
-    output_dir: str | Path | None = None,
-    sheets: Optional[List[int]] = None
-) -> List[Path]:
+def _collect_outputs(root: str, recursive: bool = False) -> List[str]:
     """
-    PDF 파일에서 악보를 인식하여 MusicXML로 변환
+    디렉토리를 한 번 훑어 MusicXML(.mxl, .musicxml) 파일 경로 수집
 
     Args:
-        pdf_path: PDF 악보 파일 경로
-        output_dir: 출력 디렉토리 (None이면 PDF와 같은 위치)
-        sheets: 처리할 페이지 번호 리스트 (None이면 전체)
+        root: 찾을 디렉토리
+        recursive: True면 하위 디렉토리까지 찾음
 
     Returns:
-        생성된 MusicXML 파일 경로 리스트
+        파일 경로 리스트 (없거나 디렉토리가 없으면 빈 리스트)
     """
-    pdf_path = Path(pdf_path)
+    if recursive:
+        return [
+            os.path.join(dirpath, name)
+            for dirpath, _, filenames in os.walk(root)
+            for name in filenames
+            if name.endswith(MUSICXML_SUFFIXES)
+        ]
+
+    try:
+        with os.scandir(root) as entries:
+            return [e.path for e in entries if e.name.endswith(MUSICXML_SUFFIXES) and e.is_file()]
+    except FileNotFoundError:
+        return []
+
+
+def _find_outputs(pdf_path: Path, output_dir: Path, search_all: bool = True) -> List[Path]:
+    """
+    PDF 하나에 대한 Audiveris 출력 MusicXML 파일 찾기
 
-    if not pdf_path.exists():
-        raise FileNotFoundError(f"PDF 파일을 찾을 수 없습니다: {pdf_path}")
+    Args:
+        pdf_path: 인식한 PDF 파일 경로
+        output_dir: Audiveris 출력 디렉토리
+        search_all: 책 디렉토리에 없으면 출력 디렉토리 전체에서 찾을지 여부
 
-    if output_dir is None:
-        output_dir = pdf_path.parent / f"{pdf_path.stem}_output"
-    else:
-        output_dir = Path(output_dir)
+    Returns:
+        MusicXML 파일 경로 리스트 (정렬됨, 없으면 빈 리스트)
+    """
+    # Audiveris는 {pdf_stem}/{pdf_stem}.mxl 또는 .musicxml로 저장
+    book_dir = os.path.join(output_dir, pdf_path.stem)
+
+    # 일반적인 경우: 예상 파일 이름만 확인하고 바로 반환
+    for suffix in MUSICXML_SUFFIXES:
+        candidate = os.path.join(book_dir, f"{pdf_path.stem}{suffix}")
+        if os.path.isfile(candidate):
+            return [Path(candidate)]
+
+    # 악장별 출력 등 이름이 다르면 책 디렉토리 전체 확인
+    # (.mxl에는 전체 악보 opus 파일 *.opus.mxl도 포함)
+    musicxml_files = _collect_outputs(book_dir)
+
+    if not musicxml_files and search_all:
+        # 다른 위치에서 찾기
+        musicxml_files = _collect_outputs(os.fspath(output_dir), recursive=True)
+
+    return sorted(Path(f) for f in musicxml_files)
+
+
+def recognize_pdfs(
+    pdf_paths: List[str | Path],
+    output_dir: str | Path,
+    sheets: Optional[List[int]] = None,
+    force: bool = False
+) -> Dict[Path, List[Path]]:
+    """
+    여러 PDF 파일을 한 번의 Audiveris 실행으로 인식 (JVM 시작 비용을 한 번만 부담)
+
+    Args:
+        pdf_paths: PDF 악보 파일 경로 리스트
+        output_dir: 출력 디렉토리 (PDF별로 {pdf_stem}/ 하위 디렉토리 생성)
+        sheets: 처리할 페이지 번호 리스트 (None이면 전체, 모든 PDF에 적용)
+        force: True면 이전 인식 결과가 있어도 다시 인식
+
+    Returns:
+        PDF 경로 → 생성된 MusicXML 파일 경로 리스트 딕셔너리
+        (출력이 없는 PDF는 빈 리스트)
+    """
+    pdf_paths = [Path(p) for p in pdf_paths]
+    output_dir = Path(output_dir)
+
+    for pdf_path in pdf_paths:
+        if not pdf_path.exists():
+            raise FileNotFoundError(f"PDF 파일을 찾을 수 없습니다: {pdf_path}")
+
+    # 책 디렉토리에 PDF보다 나중에 만든 MusicXML이 있으면 다시 인식하지 않음
+    done: Dict[Path, List[Path]] = {}
+    if not force and sheets is None:
+        for pdf_path in pdf_paths:
+            files = _find_outputs(pdf_path, output_dir, search_all=False)
+            if files and all(is_up_to_date(f, pdf_path) for f in files):
+                print(f"  이전 인식 결과 사용: {pdf_path.name}")
+                done[pdf_path] = files
+
+    pdf_paths = [p for p in pdf_paths if p not in done]
+    if not pdf_paths:
+        return done
 
     output_dir.mkdir(parents=True, exist_ok=True)
 
@@ -70,65 +196,81 @@ def recognize_pdf(
             "/Applications/Audiveris.app이 설치되어 있는지 확인하세요."
         )
 
-    # Audiveris CLI 실행
+    # Audiveris CLI 실행 (입력 PDF를 모두 넘기면 Audiveris가 차례로 처리)
     cmd = [
         audiveris_path,
         "-batch",           # GUI 없이 실행
         "-transcribe",      # 전체 인식
         "-export",          # MusicXML 내보내기
         "-output", str(output_dir),
-        str(pdf_path)
     ]
 
     if sheets:
         # 특정 페이지만 처리
-        sheets_str = " ".join(str(s) for s in sheets)
-        cmd.insert(-1, "-sheets")
-        cmd.insert(-1, sheets_str)
+        cmd += ["-sheets", " ".join(str(s) for s in sheets)]
 
-    print(f"  Audiveris 실행 중: {pdf_path.name}")
+    cmd += [str(p) for p in pdf_paths]
+
+    print(f"  Audiveris 실행 중: {', '.join(p.name for p in pdf_paths)}")
     print(f"  출력 디렉토리: {output_dir}")
 
-    result = subprocess.run(
-        cmd,
-        capture_output=True,
-        text=True,
-        timeout=600  # 10분 타임아웃
-    )
+    # 출력은 메모리에 모으지 않고 로그 파일로 바로 기록
+    log_path = output_dir / "audiveris.log"
+    with open(log_path, "wb") as log:
+        result = subprocess.run(
+            cmd,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            timeout=600 * len(pdf_paths)  # PDF당 10분 타임아웃
+        )
 
     if result.returncode != 0:
         # Audiveris는 경고가 있어도 0이 아닌 코드를 반환할 수 있음
         # MusicXML 파일이 생성되었는지 확인
         pass
 
-    # 출력 파일 찾기
-    # Audiveris는 {pdf_stem}/{pdf_stem}.mxl 또는 .musicxml로 저장
-    book_dir = output_dir / pdf_path.stem
+    # 출력 파일 찾기 (여러 PDF를 함께 처리했으면 다른 책의 출력과 섞이지 않도록 책 디렉토리만 확인)
+    search_all = len(pdf_paths) == 1
+    results = {p: _find_outputs(p, output_dir, search_all) for p in pdf_paths}
+
+    if not any(results.values()):
+        with open(log_path, encoding="utf-8", errors="replace") as log:
+            log_tail = "".join(collections.deque(log, maxlen=LOG_TAIL_LINES))
+        error_msg = f"MusicXML 출력 파일을 찾을 수 없습니다. (종료 코드 {result.returncode})\n"
+        error_msg += f"Audiveris 로그 ({log_path}) 마지막 부분:\n{log_tail}"
+        raise FileNotFoundError(error_msg)
 
-    musicxml_files = []
+    for pdf_path, files in results.items():
+        if not files:
+            print(f"  실패: {pdf_path.name} (MusicXML 출력 없음)")
 
-    # .mxl (압축) 파일 찾기
-    mxl_files = list(book_dir.glob("*.mxl")) if book_dir.exists() else []
+    return {**done, **results}
 
-    # .musicxml 파일 찾기
-    xml_files = list(book_dir.glob("*.musicxml")) if book_dir.exists() else []
 
-    # opus 파일 (전체 악보) 찾기
-    opus_files = list(book_dir.glob("*.opus.mxl")) if book_dir.exists() else []
+def recognize_pdf(
+    pdf_path: str | Path,
+    output_dir: str | Path | None = None,
+    sheets: Optional[List[int]] = None,
+    force: bool = False
+) -> List[Path]:
+    """
+    PDF 파일에서 악보를 인식하여 MusicXML로 변환
 
-    musicxml_files = mxl_files + xml_files
+    Args:
+        pdf_path: PDF 악보 파일 경로
+        output_dir: 출력 디렉토리 (None이면 PDF와 같은 위치)
+        sheets: 처리할 페이지 번호 리스트 (None이면 전체)
+        force: True면 이전 인식 결과가 있어도 다시 인식
 
-    if not musicxml_files:
-        # 다른 위치에서 찾기
-        musicxml_files = list(output_dir.glob("**/*.mxl")) + list(output_dir.glob("**/*.musicxml"))
+    Returns:
+        생성된 MusicXML 파일 경로 리스트
+    """
+    pdf_path = Path(pdf_path)
 
-    if not musicxml_files:
-        error_msg = f"MusicXML 출력 파일을 찾을 수 없습니다.\n"
-        error_msg += f"Audiveris stdout:\n{result.stdout}\n"
-        error_msg += f"Audiveris stderr:\n{result.stderr}"
-        raise FileNotFoundError(error_msg)
+    if output_dir is None:
+        output_dir = pdf_path.parent / f"{pdf_path.stem}_output"
 
-    return sorted(musicxml_files)
+    return recognize_pdfs([pdf_path], output_dir, sheets, force)[pdf_path]
 
 
 def recognize_score(
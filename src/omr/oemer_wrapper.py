@@ -1,23 +1,40 @@
 """oemer OMR 엔진 래퍼 모듈"""
 
+import os
+import shutil
 import subprocess
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterable, List, Optional
+
+from src.cache import cache_enabled, copy_atomic, file_digest, get_cache_dir, is_up_to_date
+
+
+# oemer는 프로세스마다 딥러닝 모델을 로드하므로 메모리에 맞게 동시 실행 수 제한
+DEFAULT_OMR_WORKERS = max(1, min((os.cpu_count() or 1) // 2, 4))
 
 
 def recognize_image(
     image_path: str | Path,
     output_dir: str | Path | None = None,
-    use_cache: bool = False
+    use_cache: bool = False,
+    force: bool = False,
+    omr_cache: bool = True
 ) -> Path:
     """
     단일 이미지에서 악보를 인식하여 MusicXML로 변환
 
+    같은 내용의 이미지를 인식한 결과는 디스크(~/.cache/pdf-score-converter/omr)에
+    저장해 두었다가 다시 인식할 때 복사만 한다.
+
     Args:
         image_path: 악보 이미지 경로
         output_dir: 출력 디렉토리 (None이면 이미지와 같은 위치)
         use_cache: 캐시 사용 여부 (이전 예측 결과 재사용)
+        force: True면 이전 인식 결과가 있어도 다시 인식
+        omr_cache: False면 이미지 해시 기반 OMR 결과 캐시를 사용하지 않음
 
     Returns:
         생성된 MusicXML 파일 경로
@@ -34,6 +51,21 @@ def recognize_image(
 
     output_dir.mkdir(parents=True, exist_ok=True)
 
+    # 이미지보다 나중에 만든 MusicXML이 있으면 그대로 사용
+    expected_path = output_dir / f"{image_path.stem}.musicxml"
+    if not force and is_up_to_date(expected_path, image_path):
+        print(f"  이전 인식 결과 사용: {expected_path.name}")
+        return expected_path
+
+    # 이미지 내용 해시로 이전 실행의 인식 결과 찾기
+    cache_path = None
+    if omr_cache and cache_enabled():
+        cache_path = get_cache_dir("omr") / f"{file_digest(image_path, b'oemer')}.musicxml"
+        if cache_path.exists():
+            shutil.copyfile(cache_path, expected_path)
+            print(f"  캐시된 인식 결과 사용: {expected_path.name}")
+            return expected_path
+
     # oemer CLI 실행
     cmd = [
         "oemer",
@@ -56,49 +88,68 @@ def recognize_image(
         raise RuntimeError(f"oemer 실행 실패:\n{result.stderr}")
 
     # 출력 파일 찾기 (oemer는 {이미지명}.musicxml 로 저장)
-    output_path = output_dir / f"{image_path.stem}.musicxml"
+    # 여러 페이지를 같은 디렉토리에서 동시에 인식하므로 다른 이름의 파일은 다른 페이지 결과일 수 있음
+    output_path = expected_path
 
     if not output_path.exists():
-        # 다른 가능한 이름 확인
-        possible_outputs = list(output_dir.glob("*.musicxml"))
-        if possible_outputs:
-            output_path = possible_outputs[-1]  # 가장 최근 파일
-        else:
-            raise FileNotFoundError(
-                f"MusicXML 출력 파일을 찾을 수 없습니다. oemer 출력:\n{result.stdout}"
-            )
+        raise FileNotFoundError(
+            f"MusicXML 출력 파일을 찾을 수 없습니다: {output_path.name}\noemer 출력:\n{result.stdout}"
+        )
+
+    # 캐시 저장 실패는 인식 결과에 영향을 주지 않음
+    if cache_path is not None:
+        try:
+            copy_atomic(output_path, cache_path)
+        except OSError as e:
+            print(f"  경고: OMR 캐시 저장 실패 - {e}")
 
     return output_path
 
 
 def recognize_images(
-    image_paths: List[str | Path],
+    image_paths: Iterable[str | Path],
     output_dir: str | Path | None = None,
-    use_cache: bool = False
+    use_cache: bool = False,
+    max_workers: int = DEFAULT_OMR_WORKERS,
+    omr_cache: bool = True
 ) -> List[Path]:
     """
-    여러 이미지에서 악보를 인식
+    여러 이미지에서 악보를 인식 (이미지별 oemer 실행을 동시에 진행)
+
+    image_paths가 제너레이터(예: pdf_to_images_iter)이면 이미지가 만들어지는 대로
+    인식을 시작하므로 PDF 변환과 OMR이 겹쳐서 실행된다.
 
     Args:
-        image_paths: 악보 이미지 경로 리스트
+        image_paths: 악보 이미지 경로 리스트 또는 이터레이터
         output_dir: 출력 디렉토리
         use_cache: 캐시 사용 여부
+        max_workers: 동시에 실행할 oemer 프로세스 수 (메모리 16GB 기준 1~4)
+        omr_cache: False면 이미지 해시 기반 OMR 결과 캐시를 사용하지 않음
 
     Returns:
-        생성된 MusicXML 파일 경로 리스트
+        생성된 MusicXML 파일 경로 리스트 (입력 순서, 실패한 이미지는 제외)
     """
-    results = []
+    total = f"/{len(image_paths)}" if hasattr(image_paths, "__len__") else ""
 
-    for i, image_path in enumerate(image_paths, start=1):
-        print(f"[{i}/{len(image_paths)}] 악보 인식 중...")
+    def recognize(i: int, image_path: str | Path) -> Optional[Path]:
+        print(f"[{i}{total}] 악보 인식 중...")
+        start = time.perf_counter()
         try:
-            result = recognize_image(image_path, output_dir, use_cache)
-            results.append(result)
-            print(f"  완료: {result.name}")
+            result = recognize_image(image_path, output_dir, use_cache, omr_cache=omr_cache)
+            print(f"  완료: {result.name} ({time.perf_counter() - start:.1f}초)")
+            return result
         except Exception as e:
             print(f"  실패: {e}")
+            return None
+
+    # 이미지 경로를 받는 즉시 작업 스레드에 넘김 (스레드는 oemer 프로세스를 기다리기만 함)
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = [
+            executor.submit(recognize, i, image_path)
+            for i, image_path in enumerate(image_paths, start=1)
+        ]
 
-    return results
+    return [r for r in (f.result() for f in futures) if r is not None]
 
 
 def recognize_score(
@@ -117,7 +168,7 @@ def recognize_score(
     Returns:
         생성된 MusicXML 파일 경로 리스트
     """
-    from src.pdf import pdf_to_images
+    from src.pdf import pdf_to_images_iter
 
     pdf_path = Path(pdf_path)
 
@@ -128,13 +179,11 @@ def recognize_score(
 
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    print(f"1단계: PDF를 이미지로 변환 중...")
+    # 페이지가 이미지로 저장되는 대로 인식 시작 (변환과 OMR을 겹쳐서 실행)
+    print(f"1~2단계: PDF를 이미지로 변환하며 악보 인식 (OMR) 중...")
     image_dir = output_dir / "images"
-    image_paths = pdf_to_images(pdf_path, image_dir, dpi=dpi)
-    print(f"  {len(image_paths)}개 페이지 변환 완료\n")
-
-    print(f"2단계: 악보 인식 (OMR) 중...")
     musicxml_dir = output_dir / "musicxml"
+    image_paths = pdf_to_images_iter(pdf_path, image_dir, dpi=dpi)
     musicxml_paths = recognize_images(image_paths, musicxml_dir)
     print(f"  {len(musicxml_paths)}개 MusicXML 생성 완료\n")
 
@@ -1,6 +1,6 @@
 """PDF 처리 모듈"""
 
-from .pdf_to_image import pdf_to_images
+from .pdf_to_image import pdf_to_images, pdf_to_images_iter
 from .part_pdf import musicxml_to_pdf, export_parts_pdf
 
-__all__ = ["pdf_to_images", "musicxml_to_pdf", "export_parts_pdf"]
+__all__ = ["pdf_to_images", "pdf_to_images_iter", "musicxml_to_pdf", "export_parts_pdf"]
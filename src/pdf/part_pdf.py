@@ -1,17 +1,69 @@
-"""성부별 PDF 생성 모듈 (MuseScore 사용)"""
+"""성부별 PDF 생성 모듈 (MuseScore 사용)
 
+여러 파일을 변환할 때는 MuseScore 잡 파일(-j, MuseScore 3 이상)로
+한 프로세스에서 일괄 변환하여 실행마다 드는 시작 비용을 줄인다.
+잡은 코어 수만큼 나누어 MuseScore 프로세스 여러 개로 동시에 실행한다.
+"""
+
+import json
+import os
+import shutil
 import subprocess
+import threading
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
+
+from src.cache import is_up_to_date, load_tool_path, save_tool_path
+
 
+# 동시에 실행할 MuseScore 프로세스 최대 개수 (너무 많으면 오히려 느려짐)
+MAX_MUSESCORE_WORKERS = 8
 
-def find_musescore() -> Optional[str]:
+# find_musescore 결과 (strict 여부 → 경로)와 첫 탐색이 중복 실행되지 않도록 하는 잠금
+_found_paths: Dict[bool, Optional[str]] = {}
+_find_lock = threading.Lock()
+
+
+def find_musescore(strict: bool = False) -> Optional[str]:
     """
     시스템에서 MuseScore 실행 파일 찾기
 
+    PATH 검색(shutil.which)과 파일 존재 여부로만 찾고, 결과는 프로세스 안에서
+    재사용하며 캐시(tools.json)에도 저장한다. 여러 스레드가 동시에 호출해도
+    탐색은 한 번만 실행된다.
+
+    Args:
+        strict: True면 저장된 경로를 쓰지 않고 --version으로 실제 실행되는지 확인
+
     Returns:
         MuseScore 실행 경로 (없으면 None)
     """
+    # 이미 찾았으면 잠금 없이 반환
+    try:
+        return _found_paths[strict]
+    except KeyError:
+        pass
+
+    with _find_lock:
+        if strict not in _found_paths:
+            _found_paths[strict] = _discover_musescore(strict)
+        return _found_paths[strict]
+
+
+def prefetch() -> None:
+    """MuseScore 경로를 미리 찾아 둠 (PDF 스레드를 시작하기 전에 호출)"""
+    find_musescore()
+
+
+def _discover_musescore(strict: bool) -> Optional[str]:
+    """find_musescore의 실제 탐색"""
+    if not strict:
+        cached = load_tool_path("musescore")
+        if cached is not None:
+            return cached
+
     # 가능한 MuseScore 경로들
     possible_paths = [
         "mscore",  # Homebrew symlink
@@ -22,24 +74,33 @@ def find_musescore() -> Optional[str]:
     ]
 
     for path in possible_paths:
-        try:
-            result = subprocess.run(
-                [path, "--version"],
-                capture_output=True,
-                timeout=5
-            )
-            if result.returncode == 0:
-                return path
-        except (FileNotFoundError, subprocess.TimeoutExpired):
+        resolved = shutil.which(path) or (path if os.path.exists(path) else None)
+        if resolved is None:
             continue
 
+        if strict:
+            try:
+                result = subprocess.run(
+                    [resolved, "--version"],
+                    capture_output=True,
+                    timeout=5
+                )
+            except (OSError, subprocess.TimeoutExpired):
+                continue
+            if result.returncode != 0:
+                continue
+
+        save_tool_path("musescore", resolved)
+        return resolved
+
     return None
 
 
 def musicxml_to_pdf(
     musicxml_path: str | Path,
     output_path: str | Path,
-    musescore_path: Optional[str] = None
+    musescore_path: Optional[str] = None,
+    force: bool = False
 ) -> Path:
     """
     MusicXML 파일을 PDF로 변환
@@ -48,6 +109,7 @@ def musicxml_to_pdf(
         musicxml_path: MusicXML 파일 경로
         output_path: 출력 PDF 파일 경로
         musescore_path: MuseScore 실행 파일 경로 (None이면 자동 탐색)
+        force: True면 PDF가 최신이어도 다시 생성
 
     Returns:
         생성된 PDF 파일 경로
@@ -59,6 +121,10 @@ def musicxml_to_pdf(
     if not musicxml_path.exists():
         raise FileNotFoundError(f"MusicXML 파일을 찾을 수 없습니다: {musicxml_path}")
 
+    # MusicXML보다 나중에 만든 PDF가 있으면 그대로 사용
+    if not force and is_up_to_date(output_path, musicxml_path):
+        return output_path
+
     # MuseScore 찾기
     if musescore_path is None:
         musescore_path = find_musescore()
@@ -75,15 +141,18 @@ def musicxml_to_pdf(
         str(musicxml_path)
     ]
 
-    result = subprocess.run(
-        cmd,
-        capture_output=True,
-        text=True,
-        timeout=60
-    )
+    # 출력은 임시 로그 파일로 받고 실패했을 때만 읽음
+    with tempfile.TemporaryFile() as log:
+        result = subprocess.run(
+            cmd,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            timeout=60
+        )
 
-    if result.returncode != 0:
-        raise RuntimeError(f"PDF 생성 실패: {result.stderr}")
+        if result.returncode != 0:
+            log.seek(0)
+            raise RuntimeError(f"PDF 생성 실패: {log.read().decode('utf-8', errors='replace')}")
 
     if not output_path.exists():
         raise FileNotFoundError(f"PDF 파일이 생성되지 않았습니다: {output_path}")
@@ -91,10 +160,38 @@ def musicxml_to_pdf(
     return output_path
 
 
+def _run_job_file(
+    jobs: List[Tuple[Path, Path]],
+    musescore_path: str
+) -> None:
+    """
+    MuseScore 잡 파일(-j)로 여러 파일을 한 번에 변환
+
+    Args:
+        jobs: (MusicXML 경로, 출력 PDF 경로) 리스트
+        musescore_path: MuseScore 실행 파일 경로
+    """
+    job_list = [{"in": os.fspath(src), "out": os.fspath(dst)} for src, dst in jobs]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        job_path = os.path.join(tmp_dir, "jobs.json")
+        with open(job_path, "w", encoding="utf-8") as f:
+            json.dump(job_list, f, ensure_ascii=False)
+
+        # 실패한 파일은 파일별 변환에서 다시 확인하므로 출력은 버림
+        subprocess.run(
+            [musescore_path, "-j", job_path],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=60 * len(jobs)
+        )
+
+
 def export_parts_pdf(
     parts_dir: str | Path,
     output_dir: str | Path,
-    musescore_path: Optional[str] = None
+    musescore_path: Optional[str] = None,
+    force: bool = False
 ) -> Dict[str, Path]:
     """
     디렉토리 내 모든 MusicXML 파일을 PDF로 변환
@@ -103,9 +200,10 @@ def export_parts_pdf(
         parts_dir: MusicXML 파일 디렉토리
         output_dir: PDF 출력 디렉토리
         musescore_path: MuseScore 실행 파일 경로
+        force: True면 최신 PDF가 있어도 모두 다시 생성
 
     Returns:
-        파트명 → PDF 파일 경로 딕셔너리
+        파트명 → PDF 파일 경로 딕셔너리 (변환에 실패한 파트는 제외)
     """
     parts_dir = Path(parts_dir)
     output_dir = Path(output_dir)
@@ -115,18 +213,65 @@ def export_parts_pdf(
 
     # .musicxml과 .xml 파일 모두 처리
     musicxml_files = list(parts_dir.glob("*.musicxml")) + list(parts_dir.glob("*.xml"))
+    jobs = [(f, output_dir / f"{f.stem}.pdf") for f in sorted(musicxml_files)]
+
+    # MusicXML보다 나중에 만든 PDF가 있는 파트는 건너뜀
+    pending = []
+    for musicxml_file, pdf_path in jobs:
+        if force or not is_up_to_date(pdf_path, musicxml_file):
+            pending.append((musicxml_file, pdf_path))
+        else:
+            print(f"  최신 PDF 있음: {pdf_path.name}")
+
+    if not pending:
+        return {musicxml_file.stem: pdf_path for musicxml_file, pdf_path in jobs}
 
-    for musicxml_file in sorted(musicxml_files):
-        part_name = musicxml_file.stem
-        pdf_path = output_dir / f"{part_name}.pdf"
+    # MuseScore 찾기 (한 번만, 없으면 파일별 오류처럼 출력하고 최신 PDF만 반환)
+    if musescore_path is None:
+        musescore_path = find_musescore()
+        if musescore_path is None:
+            print("  오류: MuseScore를 찾을 수 없습니다. brew install --cask musescore 로 설치하세요.")
+            return {
+                musicxml_file.stem: pdf_path
+                for musicxml_file, pdf_path in jobs
+                if (musicxml_file, pdf_path) not in pending
+            }
 
+    for musicxml_file, pdf_path in pending:
         print(f"  PDF 생성 중: {musicxml_file.name} → {pdf_path.name}")
 
+    # 기존 PDF가 남아 있으면 일괄 변환 성공 여부를 알 수 없으므로 먼저 삭제
+    for _, pdf_path in pending:
+        pdf_path.unlink(missing_ok=True)
+
+    # 잡을 워커 수만큼 나누어 각각 한 번의 MuseScore 실행으로 변환
+    max_workers = min(os.cpu_count() or 1, MAX_MUSESCORE_WORKERS, len(pending))
+    chunks = [pending[i::max_workers] for i in range(max_workers)]
+
+    def run_chunk(chunk: List[Tuple[Path, Path]]) -> None:
         try:
-            musicxml_to_pdf(musicxml_file, pdf_path, musescore_path)
-            results[part_name] = pdf_path
+            _run_job_file(chunk, musescore_path)
+        except subprocess.TimeoutExpired as e:
+            print(f"  일괄 변환 시간 초과, 파일별로 다시 시도: {e}")
+
+    def retry(job: Tuple[Path, Path]) -> Optional[Path]:
+        musicxml_file, pdf_path = job
+        try:
+            return musicxml_to_pdf(musicxml_file, pdf_path, musescore_path)
         except Exception as e:
-            print(f"  오류: {e}")
+            print(f"  오류 ({musicxml_file.name}): {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(run_chunk, chunks))
+
+        # 일괄 변환에서 빠진 파일은 하나씩 다시 변환
+        missing = [job for job in pending if not job[1].exists()]
+        failed = {job for job, path in zip(missing, executor.map(retry, missing)) if path is None}
+
+    for job in jobs:
+        if job not in failed:
+            results[job[0].stem] = job[1]
 
     return results
 
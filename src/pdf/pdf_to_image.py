@@ -1,28 +1,151 @@
 """PDF를 이미지로 변환하는 모듈"""
 
+import os
+import tempfile
 from pathlib import Path
-from typing import List
-from pdf2image import convert_from_path
-from PIL import Image
+from typing import Iterator, List, Optional, Tuple
 
+# PyMuPDF가 있으면 페이지를 하나씩 렌더링하여 바로 저장 (없으면 pdf2image 사용)
+try:
+    import fitz
+except ImportError:
+    fitz = None
 
-def pdf_to_images(
+# auto_dpi 사용 시 허용하는 해상도 범위
+AUTO_DPI_RANGE = (150, 400)
+
+# JPEG 저장 품질 (85 이상이면 OMR 정확도 차이가 거의 없음)
+JPEG_QUALITY = 92
+
+
+def _auto_dpi(width_pt: float, height_pt: float, max_longest_dim: int) -> float:
+    """긴 변이 max_longest_dim 픽셀이 되는 해상도 (AUTO_DPI_RANGE로 제한)"""
+    lo, hi = AUTO_DPI_RANGE
+    return min(max(72 * max_longest_dim / max(width_pt, height_pt), lo), hi)
+
+
+def _render_pymupdf(
+    pdf_path: Path,
+    output_dir: Path,
+    dpi: int,
+    fmt: str,
+    max_longest_dim: Optional[int] = None
+) -> Iterator[Path]:
+    """PyMuPDF로 페이지를 한 장씩 렌더링하여 저장 (메모리에는 한 페이지만 유지)"""
+    zoom = dpi / 72
+    matrix = fitz.Matrix(zoom, zoom)
+
+    with fitz.open(pdf_path) as doc:
+        for i, page in enumerate(doc, start=1):
+            output_path = output_dir / f"page_{i:03d}.{fmt}"
+            if max_longest_dim is not None:
+                # 페이지 크기(pt)에 맞춰 페이지별 해상도 결정
+                zoom = _auto_dpi(page.rect.width, page.rect.height, max_longest_dim) / 72
+                matrix = fitz.Matrix(zoom, zoom)
+            pix = page.get_pixmap(matrix=matrix, alpha=False)
+            if fmt == "png":
+                pix.save(str(output_path))
+            else:
+                pix.save(str(output_path), jpg_quality=JPEG_QUALITY)
+            print(f"  저장됨: {output_path.name}")
+            yield output_path
+
+
+def _page_dpi_runs(
+    pdf_path: Path,
+    dpi: int,
+    max_longest_dim: Optional[int]
+) -> List[Tuple[Optional[int], Optional[int], float]]:
+    """
+    연속한 페이지를 같은 해상도끼리 묶은 (첫 페이지, 마지막 페이지, dpi) 리스트
+
+    max_longest_dim이 있으면 PyMuPDF 경로와 같이 페이지 크기(pt)로 _auto_dpi를 계산한다.
+    없으면 PDF를 읽지 않고 전체 페이지 하나의 구간 (None, None, dpi)만 반환한다.
+    """
+    if max_longest_dim is None:
+        return [(None, None, dpi)]
+
+    from PyPDF2 import PdfReader
+
+    runs: List[Tuple[Optional[int], Optional[int], float]] = []
+    for i, page in enumerate(PdfReader(pdf_path).pages, start=1):
+        box = page.cropbox
+        page_dpi = _auto_dpi(float(box.width), float(box.height), max_longest_dim)
+        if runs and runs[-1][2] == page_dpi:
+            runs[-1] = (runs[-1][0], i, page_dpi)
+        else:
+            runs.append((i, i, page_dpi))
+    return runs
+
+
+def _render_pdf2image(
+    pdf_path: Path,
+    output_dir: Path,
+    dpi: int,
+    fmt: str,
+    max_longest_dim: Optional[int] = None
+) -> Iterator[Path]:
+    """
+    pdf2image(Poppler)로 페이지를 변환한 뒤 저장
+
+    max_longest_dim을 주면 페이지별 해상도를 PyMuPDF 경로와 같은 방식(AUTO_DPI_RANGE 제한)으로
+    정하고, 해상도가 같은 연속 페이지를 한 번에 변환한다.
+    """
+    from pdf2image import convert_from_path
+
+    # Poppler가 여러 스레드로 페이지를 나누어 렌더링하고 임시 폴더에 바로 기록
+    # (페이지가 많으면 macOS에서는 ulimit -n을 늘려야 할 수 있음)
+    # paths_only=True이므로 이미지를 Python으로 읽지 않고 파일 이름만 바꿈
+    with tempfile.TemporaryDirectory(dir=output_dir) as tmp_dir:
+        for first, last, page_dpi in _page_dpi_runs(pdf_path, dpi, max_longest_dim):
+            rendered = convert_from_path(
+                pdf_path,
+                dpi=page_dpi,
+                fmt=fmt,
+                first_page=first,
+                last_page=last,
+                thread_count=max(1, (os.cpu_count() or 1) - 1),
+                output_folder=tmp_dir,
+                # 변환마다 다른 접두어를 써야 이전 변환 파일이 결과에 섞이지 않음
+                output_file=f"page{first or 1:04d}_",
+                paths_only=True,
+                jpegopt={"quality": JPEG_QUALITY, "progressive": False, "optimize": False}
+            )
+
+            # 반환 경로는 페이지 순서로 정렬되어 있음
+            for i, rendered_path in enumerate(rendered, start=first or 1):
+                output_path = output_dir / f"page_{i:03d}.{fmt}"
+                os.replace(rendered_path, output_path)
+                print(f"  저장됨: {output_path.name}")
+                yield output_path
+
+
+def pdf_to_images_iter(
     pdf_path: str | Path,
     output_dir: str | Path | None = None,
     dpi: int = 300,
-    fmt: str = "png"
-) -> List[Path]:
+    fmt: str = "jpg",
+    auto_dpi: bool = False,
+    max_longest_dim: int = 2200,
+    lossless: bool = False
+) -> Iterator[Path]:
     """
-    PDF 파일을 페이지별 이미지로 변환
+    PDF 파일을 페이지별 이미지로 변환하면서 저장된 이미지 경로를 차례로 반환
+
+    다음 단계(OMR)가 첫 페이지부터 바로 시작할 수 있도록 페이지가 저장될 때마다 yield한다.
 
     Args:
         pdf_path: PDF 파일 경로
         output_dir: 출력 디렉토리 (None이면 PDF와 같은 위치)
         dpi: 이미지 해상도 (기본 300dpi - OMR에 적합)
-        fmt: 출력 형식 (png, jpg)
+        fmt: 출력 형식 (jpg, png - 기본 jpg는 PNG보다 인코딩이 빠르고 용량이 약 1/6)
+        auto_dpi: True면 dpi 대신 페이지 크기에 맞춰 긴 변이 max_longest_dim 픽셀이
+            되는 해상도로 렌더링 (150~400dpi, 큰 악보에서 OMR 시간 단축)
+        max_longest_dim: auto_dpi 사용 시 이미지 긴 변의 목표 픽셀 수
+        lossless: True면 fmt와 관계없이 무손실 PNG로 저장
 
-    Returns:
-        생성된 이미지 파일 경로 리스트
+    Yields:
+        저장된 이미지 파일 경로 (페이지 순서)
     """
     pdf_path = Path(pdf_path)
 
@@ -36,22 +159,45 @@ def pdf_to_images(
 
     output_dir.mkdir(parents=True, exist_ok=True)
 
+    if lossless:
+        fmt = "png"
+    elif fmt == "jpeg":
+        fmt = "jpg"
+
     # PDF를 이미지로 변환
-    images: List[Image.Image] = convert_from_path(
-        pdf_path,
-        dpi=dpi,
-        fmt=fmt
-    )
-
-    # 이미지 저장
-    output_paths: List[Path] = []
-    for i, image in enumerate(images, start=1):
-        output_path = output_dir / f"page_{i:03d}.{fmt}"
-        image.save(output_path, fmt.upper())
-        output_paths.append(output_path)
-        print(f"  저장됨: {output_path.name}")
-
-    return output_paths
+    longest_dim = max_longest_dim if auto_dpi else None
+    if fitz is not None:
+        yield from _render_pymupdf(pdf_path, output_dir, dpi, fmt, longest_dim)
+    else:
+        yield from _render_pdf2image(pdf_path, output_dir, dpi, fmt, longest_dim)
+
+
+def pdf_to_images(
+    pdf_path: str | Path,
+    output_dir: str | Path | None = None,
+    dpi: int = 300,
+    fmt: str = "jpg",
+    auto_dpi: bool = False,
+    max_longest_dim: int = 2200,
+    lossless: bool = False
+) -> List[Path]:
+    """
+    PDF 파일을 페이지별 이미지로 변환
+
+    Args:
+        pdf_path: PDF 파일 경로
+        output_dir: 출력 디렉토리 (None이면 PDF와 같은 위치)
+        dpi: 이미지 해상도 (기본 300dpi - OMR에 적합)
+        fmt: 출력 형식 (jpg, png - 기본 jpg는 PNG보다 인코딩이 빠르고 용량이 약 1/6)
+        auto_dpi: True면 dpi 대신 페이지 크기에 맞춰 긴 변이 max_longest_dim 픽셀이
+            되는 해상도로 렌더링 (150~400dpi, 큰 악보에서 OMR 시간 단축)
+        max_longest_dim: auto_dpi 사용 시 이미지 긴 변의 목표 픽셀 수
+        lossless: True면 fmt와 관계없이 무손실 PNG로 저장
+
+    Returns:
+        생성된 이미지 파일 경로 리스트
+    """
+    return list(pdf_to_images_iter(pdf_path, output_dir, dpi, fmt, auto_dpi, max_longest_dim, lossless))
 
 
 if __name__ == "__main__":
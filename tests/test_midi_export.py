@@ -0,0 +1,85 @@
+"""MIDI 내보내기 모듈 테스트"""
+
+from fractions import Fraction
+
+import pytest
+
+music21 = pytest.importorskip("music21")
+mido = pytest.importorskip("mido")
+from music21 import chord, meter, note, stream, tie
+
+from src.converter.midi_export import export_midi
+
+
+def _small_score() -> stream.Score:
+    """붙임줄(마디를 넘는 음)과 화음이 있는 2마디 악보"""
+    part = stream.Part()
+
+    m1 = stream.Measure(number=1)
+    m1.append(meter.TimeSignature("4/4"))
+    m1.append(note.Note("C4", quarterLength=1))
+    m1.append(chord.Chord(["E4", "G4"], quarterLength=1))
+    m1.append(note.Rest(quarterLength=1))
+    tied = note.Note("D4", quarterLength=1)
+    tied.tie = tie.Tie("start")
+    m1.append(tied)
+
+    m2 = stream.Measure(number=2)
+    tied_end = note.Note("D4", quarterLength=2)
+    tied_end.tie = tie.Tie("stop")
+    m2.append(tied_end)
+    m2.append(note.Note("F4", quarterLength=2))
+
+    part.append([m1, m2])
+    score = stream.Score()
+    score.insert(0, part)
+    return score
+
+
+def _note_tuples(path) -> list:
+    """MIDI 파일의 음표를 (시작, 끝, pitch) 목록으로 (4분음표 단위, 정렬)"""
+    mf = mido.MidiFile(str(path))
+    result = []
+    for track in mf.tracks:
+        tick = 0
+        started = {}
+        for msg in track:
+            tick += msg.time
+            if msg.type == "note_on" and msg.velocity > 0:
+                started[msg.note] = tick
+            elif msg.type in ("note_on", "note_off") and msg.note in started:
+                start = started.pop(msg.note)
+                result.append((
+                    Fraction(start, mf.ticks_per_beat),
+                    Fraction(tick, mf.ticks_per_beat),
+                    msg.note
+                ))
+    return sorted(result)
+
+
+def test_mido_export_matches_music21(tmp_path):
+    mido_path = export_midi(_small_score(), tmp_path / "mido.mid")
+    legacy_path = export_midi(_small_score(), tmp_path / "legacy.mid", legacy=True)
+
+    expected = [
+        (0, 1, 60),
+        (1, 2, 64),
+        (1, 2, 67),
+        (3, 6, 62),
+        (6, 8, 65),
+    ]
+    assert _note_tuples(mido_path) == _note_tuples(legacy_path) == expected
+
+
+def test_very_short_note_is_not_stuck(tmp_path):
+    score = stream.Score()
+    part = stream.Part()
+    part.append(note.Note("C4", quarterLength=Fraction(1, 1024)))
+    part.append(note.Note("E4", quarterLength=1))
+    score.insert(0, part)
+
+    notes = _note_tuples(export_midi(score, tmp_path / "short.mid"))
+
+    # note_on 다음에 note_off가 와서 두 음 모두 닫혀야 함
+    assert [pitch for _, _, pitch in notes] == [60, 64]
+    assert all(start < end for start, end, _ in notes)
@@ -0,0 +1,56 @@
+"""스트리밍 MusicXML 저장 모듈 테스트"""
+
+import pytest
+
+music21 = pytest.importorskip("music21")
+from music21 import converter, meter, note, stream
+
+from src.converter.musicxml_stream_writer import write_part_musicxml
+from src.converter.part_splitter import split_grand_staff
+
+
+def _grand_staff_part() -> stream.Part:
+    """3/4 대보표: 1마디는 상/하단 모두, 2마디는 하단만, 3마디는 상단만 마디 끝까지 채움"""
+    part = stream.Part()
+
+    m1 = stream.Measure(number=1)
+    m1.append(meter.TimeSignature("3/4"))
+    m1.insert(0, note.Note("C5", quarterLength=3))
+    m1.insert(0, note.Note("C3", quarterLength=3))
+
+    # 상단은 첫 박만 있고 나머지는 비어 있음
+    m2 = stream.Measure(number=2)
+    m2.insert(0, note.Note("E5", quarterLength=1))
+    m2.insert(0, note.Note("E3", quarterLength=3))
+
+    # 하단은 두 박까지만 있음
+    m3 = stream.Measure(number=3)
+    m3.insert(0, note.Note("G5", quarterLength=3))
+    m3.insert(0, note.Note("G3", quarterLength=2))
+
+    for m in (m1, m2, m3):
+        part.append(m)
+    return part
+
+
+def _measure_offsets(path) -> list:
+    parsed = converter.parse(str(path))
+    return [m.offset for m in parsed.parts[0].getElementsByClass("Measure")]
+
+
+def _music21_offsets(part: stream.Part, path) -> list:
+    score = stream.Score()
+    score.insert(0, part)
+    score.write("musicxml", fp=str(path))
+    return _measure_offsets(path)
+
+
+@pytest.mark.parametrize("index", [0, 1])
+def test_split_grand_staff_measure_offsets_match_music21(tmp_path, index):
+    halves = split_grand_staff(_grand_staff_part())
+    part = halves[index]
+
+    streamed = write_part_musicxml(part, tmp_path / "streamed.musicxml")
+    expected = _music21_offsets(part, tmp_path / "music21.musicxml")
+
+    assert _measure_offsets(streamed) == expected == [0.0, 3.0, 6.0]
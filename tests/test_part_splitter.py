@@ -0,0 +1,39 @@
+"""성부 분리 모듈 테스트"""
+
+import pytest
+
+music21 = pytest.importorskip("music21")
+from music21 import stream
+
+from src.converter.part_splitter import VoiceType, detect_voice_type
+
+
+@pytest.mark.parametrize("name, expected", [
+    # 기존과 같은 결과
+    ("Soprano", VoiceType.SOPRANO),
+    ("Sop. 1", VoiceType.SOPRANO),
+    ("Alto", VoiceType.ALTO),
+    ("Tenor", VoiceType.TENOR),
+    ("Ten.", VoiceType.TENOR),
+    ("Bass", VoiceType.BASS),
+    ("Bas.", VoiceType.BASS),
+    ("Contrabass", VoiceType.BASS),
+    ("Piano", VoiceType.PIANO),
+    ("Violin I", VoiceType.VIOLIN),
+    ("Vln. 2", VoiceType.VIOLIN),
+    ("Oboe", VoiceType.OTHER),
+    # 여러 성부 이름이 있으면 이름 위치와 관계없이 소프라노 > 알토 > 테너 > 베이스 순
+    ("Tenor / Alto", VoiceType.ALTO),
+    ("Bass (Tenor)", VoiceType.TENOR),
+    ("Piano (Sop. cue)", VoiceType.SOPRANO),
+    # 약어는 단어 시작에서만 인정 (기존에는 단어 중간에서도 일치)
+    ("Written", VoiceType.OTHER),       # 기존: TENOR ("ten")
+    ("Sostenuto", VoiceType.OTHER),     # 기존: TENOR ("ten")
+    ("Kontrabas", VoiceType.OTHER),     # 기존: BASS ("bas")
+    ("Isopropyl", VoiceType.OTHER),     # 기존: SOPRANO ("sop")
+])
+def test_detect_voice_type_by_name(name, expected):
+    part = stream.Part()
+    part.partName = name
+
+    assert detect_voice_type(part, 0, 1) == expected